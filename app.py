@@ -11,10 +11,17 @@ from io import BytesIO
 import zipfile
 from webdriver_pool import WebDriverPool
 from automation import run_automation
-from config import districts_data, tahsil_data, village_data, WEBDRIVER_POOL_SIZE
+from utils import add_job, remove_job
+import config
+from config import WEBDRIVER_POOL_SIZE, setup_logging
+
+# Loaded without main.py (flask run, a WSGI server), app still needs logging
+# before the driver pool starts; setup_logging is a no-op when main.py already ran it
+setup_logging()
 
 # Create global objects
 logger = logging.getLogger(__name__)
+_UNSAFE_FOLDER_CHARS = re.compile(r'[^\w]')
 driver_pool = WebDriverPool(max_drivers=WEBDRIVER_POOL_SIZE)
 
 # Store running jobs
@@ -27,14 +34,14 @@ CORS(app)
 @app.route('/api/get_districts', methods=['GET'])
 def get_districts():
     # These would ideally come from a database or API
-    districts = districts_data
+    districts = config.districts_data  # Read per request so the location file loads on first use
     return jsonify({"districts": districts})
 
 @app.route('/api/get_tahsils', methods=['GET'])
 def get_tahsils():
     district = request.args.get('district')
     # In production, fetch from database or the actual IGR site
-    district_tahsil_data = tahsil_data
+    district_tahsil_data = config.tahsil_data
     
     # Default empty list for districts not in our mock data
     tahsils = district_tahsil_data.get(district, [])
@@ -49,7 +56,7 @@ def get_villages():
     tahsil = request.args.get('tahsil')
     
     # Mock data - in production, fetch from the actual source
-    tahsil_village_data = village_data
+    tahsil_village_data = config.village_data
     
     # Default empty list for tahsils not in our mock data
     villages = tahsil_village_data.get(tahsil, [])
@@ -80,13 +87,13 @@ def download_documents():
     # Create a folder for output based on input parameters
     folder_name = f"{year}_{district}_{tahsil}_{village}_{property_no}_{job_id}"
     # Use only alphanumeric characters and underscores for folder name
-    safe_folder_name = re.sub(r'[^\w]', '_', folder_name)
+    safe_folder_name = _UNSAFE_FOLDER_CHARS.sub('_', folder_name)
     
     output_dir = os.path.join("downloads", safe_folder_name)
     os.makedirs("downloads", exist_ok=True)
     
     # Initialize job info
-    jobs[job_id] = {
+    add_job(jobs, job_id, {
         "status": "starting",
         "details": {
             "year": year,
@@ -99,7 +106,7 @@ def download_documents():
         "downloaded_documents": 0,
         "directory": output_dir,
         "created_at": time.time()
-    }
+    })
     
     # Start automation in a separate thread
     threading.Thread(
@@ -208,7 +215,7 @@ def cleanup_job(job_id):
             }), 500
     
     # Remove job from dictionary
-    del jobs[job_id]
+    remove_job(jobs, job_id)
     logger.info(f"Removed job {job_id} from tracking")
     
     return jsonify({
@@ -222,7 +229,7 @@ def list_jobs():
     status_filter = request.args.get('status')
     
     jobs_list = []
-    for job_id, job_info in jobs.items():
+    for job_id, job_info in list(jobs.items()):
         # Apply status filter if provided
         if status_filter and job_info.get('status') != status_filter:
             continue
@@ -256,7 +263,7 @@ def cleanup_old_jobs():
     current_time = time.time()
     jobs_to_remove = []
     
-    for job_id, job_info in jobs.items():
+    for job_id, job_info in list(jobs.items()):
         created_at = job_info.get("created_at", 0)
         # 24 hours = 86400 seconds
         if current_time - created_at > 86400:
@@ -272,8 +279,9 @@ def cleanup_old_jobs():
     
     # Remove the jobs from the dictionary
     for job_id in jobs_to_remove:
-        del jobs[job_id]
-        logger.info(f"Removed old job {job_id} from tracking")
+        # The job may have been deleted through the API meanwhile
+        if remove_job(jobs, job_id) is not None:
+            logger.info(f"Removed old job {job_id} from tracking")
 
 # Start the cleanup thread
 def start_cleanup_scheduler():
@@ -17,6 +17,9 @@ from selenium.common.exceptions import (
 )
 from captcha_solver import solve_and_submit_captcha
 from document_processor import process_all_index_buttons
+from utils import retry, update_job, close_other_tabs, save_debug_screenshot
+from webdriver_pool import block_urls, DOCUMENT_BLOCKED_URL_PATTERNS
+from config import DEBUG_SCREENSHOTS, TEXT_ONLY_PDF
 
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,7 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
     """Run the automation to download documents with improved error handling and recovery."""
     
     driver = None
-    jobs[job_id]["status"] = "running"
+    update_job(jobs, job_id, status="running")
     
     # Create directories
     output_dir = jobs[job_id]["directory"]
@@ -34,6 +37,7 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
     
     debug_dir = os.path.join(output_dir, "debug")
     os.makedirs(debug_dir, exist_ok=True)
+    debug_prefix = debug_dir + os.sep
     
     # Initialize tracking variables
     successfully_downloaded = 0
@@ -51,31 +55,20 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
         driver = driver_pool.get_driver()
         
         # Open Website with retry logic
-        for attempt in range(3):
-            try:
-                driver.get("https://freesearchigrservice.maharashtra.gov.in/")
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                logger.info("Website opened successfully")
-                break
-            except (TimeoutException, WebDriverException) as e:
-                if attempt == 2:  # Last attempt
-                    raise
-                logger.warning(f"Failed to load website (attempt {attempt+1}): {str(e)}")
-                time.sleep(2)
+        open_website(driver)
         
         # Take screenshot of home page
-        driver.save_screenshot(os.path.join(debug_dir, "homepage.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, debug_prefix + "homepage.png")
         
         # Close Pop-up if present
         try:
             # Try multiple approaches to find close buttons
             close_buttons = driver.find_elements(By.CLASS_NAME, "btnclose")
             if not close_buttons:
-                close_buttons = driver.find_elements(By.XPATH, "//button[contains(@class, 'close')]")
+                close_buttons = driver.find_elements(By.CSS_SELECTOR, "button[class*='close']")
             if not close_buttons:
-                close_buttons = driver.find_elements(By.XPATH, "//a[contains(@class, 'close')]")
+                close_buttons = driver.find_elements(By.CSS_SELECTOR, "a[class*='close']")
                 
             if close_buttons:
                 close_buttons[0].click()
@@ -85,31 +78,11 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
             logger.info(f"No initial pop-up found or error closing it: {str(e)}")
         
         # Click "Rest of Maharashtra" with retry logic
-        for attempt in range(3):
-            try:
-                rest_maha_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//input[@id='btnOtherdistrictSearch']"))
-                )
-                driver.execute_script("arguments[0].scrollIntoView(true);", rest_maha_button)
-                time.sleep(0.5)  # Small delay after scrolling
-                driver.execute_script("arguments[0].click();", rest_maha_button)
-                logger.info("Selected 'Rest of Maharashtra'")
-                
-                # Wait for form to appear
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "ddlFromYear1"))
-                )
-                break
-            except Exception as e:
-                if attempt == 2:  # Last attempt
-                    raise
-                logger.warning(f"Failed to click 'Rest of Maharashtra' (attempt {attempt+1}): {str(e)}")
-                time.sleep(2)
-                # Close any tabs that might have opened accidentally
-                close_extra_tabs(driver)
+        select_rest_of_maharashtra(driver)
         
         # Take screenshot after "Rest of Maharashtra" selection
-        driver.save_screenshot(os.path.join(debug_dir, "after_rest_maha.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, debug_prefix + "after_rest_maha.png")
         
         # Form filling with more robust logic
         fill_form_success = fill_search_form(driver, year, district, tahsil, village, property_no, debug_dir)
@@ -117,28 +90,28 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
             raise Exception("Failed to fill search form correctly")
         
         # Take screenshot of form before submission
-        driver.save_screenshot(os.path.join(debug_dir, "form_filled.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, debug_prefix + "form_filled.png")
         
         # Solve CAPTCHA with improved handling
         logger.info("Attempting to solve CAPTCHA...")
         captcha_result = solve_and_submit_captcha(driver, property_no, max_attempts=5)
 
         if captcha_result == "NO_RECORDS":
-            jobs[job_id]["status"] = "completed"
-            jobs[job_id]["message"] = "No records found for the given criteria"
+            update_job(jobs, job_id, status="completed", message="No records found for the given criteria")
             logger.info("Job completed: No records found")
             return
         elif not captcha_result:
             error_msg = "Failed to solve CAPTCHA after multiple attempts"
             logger.error(error_msg)
-            jobs[job_id]["status"] = "failed"
-            jobs[job_id]["error"] = error_msg
-            driver.save_screenshot(os.path.join(debug_dir, "captcha_failed.png"))
+            update_job(jobs, job_id, status="failed", error=error_msg)
+            driver.save_screenshot(debug_prefix + "captcha_failed.png")
             return
 
         # CAPTCHA successful - results should be visible now
         logger.info("CAPTCHA solved successfully, results should be visible")
-        driver.save_screenshot(os.path.join(debug_dir, "after_captcha_success.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, debug_prefix + "after_captcha_success.png")
 
         # Wait a moment for any final page updates
         time.sleep(3)
@@ -146,13 +119,23 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
         # Close any tabs that might have opened
         close_extra_tabs(driver)
 
-        # Process all documents across all pages
-        processing_results = process_all_index_buttons(driver, output_dir, debug_dir, job_id, jobs)
+        # Process all documents across all pages; the CAPTCHA is behind us, so images may be skipped
+        if TEXT_ONLY_PDF:
+            block_urls(driver, DOCUMENT_BLOCKED_URL_PATTERNS)
+        try:
+            processing_results = process_all_index_buttons(driver, output_dir, debug_dir, job_id, jobs, driver_pool)
+        finally:
+            if TEXT_ONLY_PDF:
+                # The pooled driver will face another CAPTCHA
+                block_urls(driver)
 
         
         # Update job status
-        jobs[job_id]["status"] = "completed"
-        jobs[job_id]["message"] = f"Job completed. Downloaded {processing_results['documents_downloaded']}/{processing_results['documents_processed']} documents."
+        update_job(
+            jobs, job_id,
+            status="completed",
+            message=f"Job completed. Downloaded {processing_results['documents_downloaded']}/{processing_results['documents_processed']} documents."
+        )
         logger.info(f"Job completed. Downloaded {processing_results['documents_downloaded']}/{processing_results['documents_processed']} documents.")
         
     except Exception as e:
@@ -163,13 +146,12 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
         # Save screenshot if driver is available
         if driver:
             try:
-                driver.save_screenshot(os.path.join(debug_dir, "automation_failure.png"))
+                driver.save_screenshot(debug_prefix + "automation_failure.png")
             except:
                 logger.error("Failed to save error screenshot")
         
         # Update job status
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["error"] = error_message
+        update_job(jobs, job_id, status="failed", error=error_message)
         
     finally:
         # Clean up resources
@@ -194,6 +176,38 @@ def run_automation(year, district, tahsil, village, property_no, job_id, jobs, d
             logger.error(f"Error cleaning __pycache__: {str(e)}")
 
 
+@retry((TimeoutException, WebDriverException))
+def open_website(driver):
+    """Open the IGR search website and wait for the page body."""
+    driver.get("https://freesearchigrservice.maharashtra.gov.in/")
+    WebDriverWait(driver, 15).until(
+        EC.presence_of_element_located((By.TAG_NAME, "body"))
+    )
+    logger.info("Website opened successfully")
+
+
+@retry((TimeoutException, WebDriverException))
+def select_rest_of_maharashtra(driver):
+    """Click "Rest of Maharashtra" and wait for the search form to appear."""
+    try:
+        rest_maha_button = WebDriverWait(driver, 10).until(
+            EC.element_to_be_clickable((By.ID, "btnOtherdistrictSearch"))
+        )
+        driver.execute_script("arguments[0].scrollIntoView(true);", rest_maha_button)
+        time.sleep(0.5)  # Small delay after scrolling
+        driver.execute_script("arguments[0].click();", rest_maha_button)
+        logger.info("Selected 'Rest of Maharashtra'")
+        
+        # Wait for form to appear
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.ID, "ddlFromYear1"))
+        )
+    except WebDriverException:
+        # Close any tabs that might have opened accidentally before the next attempt
+        close_extra_tabs(driver)
+        raise
+
+
 def fill_search_form(driver, year, district, tahsil, village, property_no, debug_dir):
     """Fill the search form with robust error handling."""
     try:
@@ -294,20 +308,11 @@ def fill_search_form(driver, year, district, tahsil, village, property_no, debug
 def close_extra_tabs(driver):
     """Close any extra tabs that might have opened, keeping only the main tab."""
     try:
-        if len(driver.window_handles) > 1:
-            # Remember the main tab (first one)
-            main_handle = driver.window_handles[0]
-            
-            # Close all other tabs
-            for handle in driver.window_handles:
-                if handle != main_handle:
-                    driver.switch_to.window(handle)
-                    driver.close()
-                    logger.info(f"Closed extra tab {handle}")
-            
-            # Switch back to main tab
-            driver.switch_to.window(main_handle)
-            logger.info("Switched back to main tab")
+        handles = driver.window_handles
+        if len(handles) > 1:
+            # Keep the main tab (first one) and close the rest
+            closed = close_other_tabs(driver, handles[0])
+            logger.info(f"Closed {closed} extra tab(s) and switched back to main tab")
     except Exception as e:
         logger.warning(f"Error closing extra tabs: {str(e)}")
         # Try to recover by focusing on first tab
@@ -4,129 +4,338 @@ import re
 import hashlib
 import logging
 import time
-from collections import Counter
+import queue
+from io import BytesIO
+from functools import lru_cache
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image, ImageEnhance, ImageFilter, ImageOps
 import pytesseract
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from config import get_tesseract_path
+from config import get_tesseract_path, DEBUG_SCREENSHOTS, CAPTCHA_LENGTH
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except ImportError:  # tesserocr is optional; pytesseract's subprocess path is the fallback
+    PyTessBaseAPI = None
 
 logger = logging.getLogger(__name__)
 
 # Configure Tesseract path
 pytesseract.pytesseract.tesseract_cmd = get_tesseract_path()
 
-def solve_captcha_with_multiple_techniques(image_path):
-    """Try multiple techniques to solve CAPTCHA with improved error handling"""
-    techniques = [
-        {
-            "description": "Standard grayscale with contrast",
-            "preprocess": lambda img: ImageEnhance.Contrast(img.convert('L')).enhance(2).point(lambda p: p > 140 and 255)
-        },
-        {
-            "description": "High contrast grayscale",
-            "preprocess": lambda img: ImageEnhance.Contrast(img.convert('L')).enhance(3).point(lambda p: p > 160 and 255)
-        },
-        {
-            "description": "Noise reduction with median filter",
-            "preprocess": lambda img: ImageEnhance.Contrast(img.convert('L').filter(ImageFilter.MedianFilter(size=3))).enhance(2.5).point(lambda p: p > 150 and 255)
-        },
-        {
-            "description": "Sharpening filter",
-            "preprocess": lambda img: ImageEnhance.Contrast(img.convert('L').filter(ImageFilter.SHARPEN)).enhance(2).point(lambda p: p > 145 and 255)
-        },
-        {
-            "description": "Adaptive thresholding",
-            "preprocess": lambda img: ImageOps.autocontrast(img.convert('L'))
-        },
-        {
-            "description": "Bilateral filter simulation",
-            "preprocess": lambda img: ImageEnhance.Contrast(
-                ImageEnhance.Sharpness(img.convert('L')).enhance(2)
-            ).enhance(2.5).point(lambda p: p > 130 and 255)
-        },
-        {
-            "description": "Inverted colors",
-            "preprocess": lambda img: ImageOps.invert(img.convert('L'))
-        }
-    ]
+# Techniques run concurrently, so keep each Tesseract process single-threaded
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+OCR_WHITELIST = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+OCR_CONFIG = f'--psm 8 --oem 3 -c tessedit_char_whitelist={OCR_WHITELIST}'
+OCR_CHAR_CONFIG = f'--psm 10 --oem 3 -c tessedit_char_whitelist={OCR_WHITELIST}'
+
+_NON_ALNUM = re.compile(r'[^A-Z0-9]')
+_OCR_FIX = str.maketrans({'O': '0', 'I': '1', 'L': '1'})
+_CAPTCHA_OK = re.compile(r'^[A-Z0-9]{4,6}$')
+
+# Search page element locators
+_ID_CAPTCHA = "imgCaptcha_new"
+_ID_PROPERTY_INPUT = "txtAttributeValue1"
+_ID_CAPTCHA_INPUT = "txtImg1"
+_ID_SEARCH_BUTTON = "btnSearch_RestMaha"
+
+# Report the search outcome in one round trip instead of fetching page_source
+_POLL_JS = """
+var n = document.querySelectorAll("td > input[value='IndexII']").length;
+if (n > 0) return {t: 'docs', n: n};
+if (document.body && document.body.innerText.indexOf('No Records Found') >= 0) return {t: 'none'};
+return {t: 'wait'};
+"""
+
+# Hash the CAPTCHA's decoded pixels in the page; null if unavailable (not loaded or cross-origin)
+_CAPTCHA_PIXEL_HASH_JS = """
+var img = document.getElementById(arguments[0]);
+if (!img || !img.complete || !img.naturalWidth) return null;
+try {
+    var canvas = document.createElement('canvas');
+    canvas.width = img.naturalWidth;
+    canvas.height = img.naturalHeight;
+    var ctx = canvas.getContext('2d');
+    ctx.drawImage(img, 0, 0);
+    var data = ctx.getImageData(0, 0, canvas.width, canvas.height).data;
+    var h = 5381;
+    for (var k = 0; k < data.length; k++) { h = ((h << 5) + h + data[k]) | 0; }
+    return h;
+} catch (e) {
+    return null;
+}
+"""
+
+# Initialized Tesseract API handles, reused across OCR calls and threads
+_API_POOL = queue.Queue()
+
+def _checkout_api():
+    """Take an idle Tesseract API from the pool, creating one if all are busy."""
+    try:
+        return _API_POOL.get_nowait()
+    except queue.Empty:
+        api = PyTessBaseAPI(psm=PSM.SINGLE_WORD, oem=OEM.DEFAULT)
+        api.SetVariable("tessedit_char_whitelist", OCR_WHITELIST)
+        return api
+
+def ocr_image(image, single_char=False):
+    """OCR a preprocessed PIL image as a single CAPTCHA word, or one glyph if single_char."""
+    if PyTessBaseAPI is None:
+        return pytesseract.image_to_string(image, config=OCR_CHAR_CONFIG if single_char else OCR_CONFIG)
     
-    results = []
+    # In-process OCR avoids spawning a tesseract process and reloading models per call
+    api = _checkout_api()
+    try:
+        api.SetPageSegMode(PSM.SINGLE_CHAR if single_char else PSM.SINGLE_WORD)
+        if image.mode == 'L':
+            # Hand Tesseract the raw 8-bit pixels; SetImage would re-encode the image first
+            width, height = image.size
+            api.SetImageBytes(image.tobytes(), width, height, 1, width)
+        else:
+            api.SetImage(image)
+        return api.GetUTF8Text()
+    finally:
+        _API_POOL.put(api)
+
+@lru_cache(maxsize=None)
+def _threshold_table(cutoff):
+    """Lookup table mapping grayscale values above cutoff to white and the rest to black."""
+    return [255 if p > cutoff else 0 for p in range(256)]
+
+def threshold(gray, cutoff):
+    """Binarize a grayscale image; the table is built once per cutoff instead of per call."""
+    return gray.point(_threshold_table(cutoff))
+
+def otsu_threshold(gray):
+    """Pick the cutoff that best separates text from background (Otsu's method on the histogram)."""
+    hist = gray.histogram()[:256]
+    total = sum(hist)
+    sum_all = sum(value * count for value, count in enumerate(hist))
     
+    weight_bg = 0
+    sum_bg = 0
+    best_cutoff = 0
+    best_variance = -1.0
+    for cutoff, count in enumerate(hist):
+        weight_bg += count
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        sum_bg += cutoff * count
+        mean_diff = sum_bg / weight_bg - (sum_all - sum_bg) / weight_fg
+        variance = weight_bg * weight_fg * mean_diff * mean_diff
+        if variance > best_variance:
+            best_variance = variance
+            best_cutoff = cutoff
+    return best_cutoff
+
+def otsu_binarize(gray):
+    """Binarize a grayscale image at its Otsu threshold."""
+    return threshold(gray, otsu_threshold(gray))
+
+# Preprocessing techniques, most accurate first, each taking the shared grayscale CAPTCHA image
+TECHNIQUES = [
+    {
+        "description": "Contrast with Otsu threshold",
+        "preprocess": lambda gray: otsu_binarize(ImageEnhance.Contrast(gray).enhance(2))
+    },
+    {
+        "description": "Noise reduction with median filter and Otsu threshold",
+        "preprocess": lambda gray: otsu_binarize(gray.filter(ImageFilter.MedianFilter(size=3)))
+    },
+    {
+        "description": "Inverted colors",
+        "preprocess": lambda gray: ImageOps.invert(gray)
+    },
+    {
+        "description": "Adaptive thresholding",
+        "preprocess": lambda gray: ImageOps.autocontrast(gray)
+    }
+]
+
+def _clean_ocr_text(captcha_text):
+    """Fix common OCR confusions and drop anything that isn't a CAPTCHA character."""
+    captcha_text = captcha_text.strip().translate(_OCR_FIX)
+    return _NON_ALNUM.sub('', captcha_text.upper())
+
+def _run_technique(technique, gray):
+    """Apply one preprocessing technique and OCR the result in memory."""
+    processed_img = technique["preprocess"](gray)
+    
+    # OCR with specific config for CAPTCHA text
+    return _clean_ocr_text(ocr_image(processed_img)), processed_img
+
+def segment_characters(binary, min_width=2):
+    """Split a binarized image (dark text on white) into glyph crops, left to right."""
+    width, height = binary.size
+    pixels = binary.load()
+    inked = [any(pixels[x, y] == 0 for y in range(height)) for x in range(width)]
+    
+    glyphs = []
+    start = None
+    for x, has_ink in enumerate(inked + [False]):
+        if has_ink and start is None:
+            start = x
+        elif not has_ink and start is not None:
+            if x - start >= min_width:
+                glyph = binary.crop((start, 0, x, height))
+                bbox = ImageOps.invert(glyph).getbbox()
+                if bbox:
+                    glyph = glyph.crop(bbox)
+                # Tesseract reads isolated glyphs better with a white margin
+                glyphs.append(ImageOps.expand(glyph, border=4, fill=255))
+            start = None
+    return glyphs
+
+def solve_by_characters(gray, length):
+    """OCR each segmented glyph on its own; None unless exactly `length` glyphs are read."""
+    binary = otsu_binarize(gray.filter(ImageFilter.MedianFilter(size=3)))
+    glyphs = segment_characters(binary)
+    if len(glyphs) != length:
+        logger.info(f"Segmented {len(glyphs)} characters, expected {length}; using whole-image techniques")
+        return None
+    
+    # Glyphs are independent, so OCR them concurrently; map keeps them in order
+    with ThreadPoolExecutor(max_workers=length) as executor:
+        chars = executor.map(lambda glyph: ocr_image(glyph, single_char=True).strip(), glyphs)
+        captcha_text = _clean_ocr_text("".join(chars))
+    
+    if len(captcha_text) != length:
+        return None
+    return captcha_text
+
+def solve_captcha_with_multiple_techniques(image):
+    """Try multiple techniques to solve CAPTCHA (an image path or PIL image) with improved error handling"""
     try:
-        img = Image.open(image_path)
+        if isinstance(image, str):
+            image = Image.open(image)
+        # Convert once; every technique only reads this fully loaded image
+        gray = image.convert('L')
     except Exception as e:
         logger.error(f"Failed to open CAPTCHA image: {str(e)}")
         return ""
     
-    for i, technique in enumerate(techniques):
+    # For fixed-length CAPTCHAs, per-character OCR is cheaper and usually enough
+    if CAPTCHA_LENGTH:
         try:
-            # Apply the preprocessing technique
-            processed_img = technique["preprocess"](img)
-            
-            # Save preprocessed image
-            preprocessed_path = f"{image_path}_technique_{i}.png"
-            processed_img.save(preprocessed_path)
-            
-            # OCR with specific config for CAPTCHA text
-            captcha_text = pytesseract.image_to_string(
-                preprocessed_path,
-                config='--psm 8 --oem 3 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-            ).strip()
+            captcha_text = solve_by_characters(gray, CAPTCHA_LENGTH)
+            if captcha_text:
+                logger.info(f"Per-character OCR result: '{captcha_text}'")
+                return captcha_text
+        except Exception as e:
+            logger.error(f"Error with per-character OCR: {str(e)}")
+    
+    # The techniques are independent Tesseract runs, so overlap them
+    outcomes = {}
+    votes = Counter()
+    executor = ThreadPoolExecutor(max_workers=len(TECHNIQUES))
+    try:
+        futures = {
+            executor.submit(_run_technique, technique, gray): i
+            for i, technique in enumerate(TECHNIQUES)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                outcomes[i] = future.result()
+            except Exception as e:
+                logger.error(f"Error with technique {i}: {str(e)}")
+                continue
             
-            # Process the detected text to fix common OCR errors
-            captcha_text = captcha_text.replace('O', '0').replace('I', '1').replace('L', '1')
-            captcha_text = re.sub(r'[^A-Z0-9]', '', captcha_text.upper())
+            captcha_text = outcomes[i][0]
             
             # Check if result looks like a valid CAPTCHA (typically 5-6 alphanumeric characters)
-            if re.match(r'^[A-Z0-9]{4,6}$', captcha_text):
-                logger.info(f"Technique {i}: '{technique['description']}' - Result: '{captcha_text}' (VALID FORMAT)")
-                results.append(captcha_text)
+            if _CAPTCHA_OK.match(captcha_text):
+                logger.info(f"Technique {i}: '{TECHNIQUES[i]['description']}' - Result: '{captcha_text}' (VALID FORMAT)")
+                votes[captcha_text] += 1
+                # Two techniques agreeing decides the vote; skip the rest
+                if votes[captcha_text] >= 2:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        outcomes[i][1].save(os.path.join("temp_captchas", "captcha_accepted.png"))
+                    return captcha_text
             else:
-                logger.info(f"Technique {i}: '{technique['description']}' - Result: '{captcha_text}' (INVALID FORMAT)")
-                
-        except Exception as e:
-            logger.error(f"Error with technique {i}: {str(e)}")
+                logger.info(f"Technique {i}: '{TECHNIQUES[i]['description']}' - Result: '{captcha_text}' (INVALID FORMAT)")
+    finally:
+        # Every technique has its own worker, so nothing is queued; let the stragglers finish unobserved
+        executor.shutdown(wait=False)
     
-    # Choose the most common result if there are multiple valid results
-    if results:
-        most_common = Counter(results).most_common(1)[0][0]
-        return most_common
+    # No agreement; prefer the valid result from the most accurate technique
+    for i in sorted(outcomes):
+        if votes[outcomes[i][0]]:
+            return outcomes[i][0]
     
     # If no valid results, return the best guess from the first technique
+    if 0 not in outcomes:
+        return ""
     try:
-        return pytesseract.image_to_string(
-            f"{image_path}_technique_0.png",
-            config='--psm 8 --oem 3 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        ).strip()
+        return ocr_image(outcomes[0][1]).strip()
     except Exception as e:
         logger.error(f"Failed to get fallback CAPTCHA text: {str(e)}")
         return ""
 
-def get_captcha_hash(image_path):
-    """Generate a hash of the CAPTCHA image to detect changes."""
+def get_captcha_hash(png_bytes):
+    """Generate a hash of the CAPTCHA screenshot bytes to detect changes."""
+    return hashlib.blake2b(png_bytes, digest_size=16).hexdigest()
+
+def get_captcha_fingerprint(driver, use_pixels=True):
+    """Identify the CAPTCHA currently shown, or None if it can't be read right now.
+
+    Hashing pixels in the browser avoids an element screenshot per check; pass
+    use_pixels=False to hash an element screenshot instead when the canvas can't
+    be read. Fingerprints are only comparable when taken the same way.
+    """
+    if use_pixels:
+        return driver.execute_script(_CAPTCHA_PIXEL_HASH_JS, _ID_CAPTCHA)
+    captcha_elements = driver.find_elements(By.ID, _ID_CAPTCHA)
+    if not captcha_elements:
+        return None
+    return get_captcha_hash(captcha_elements[0].screenshot_as_png)
+
+def _wait_for_search_outcome(driver, captcha_hash, use_pixels=True, timeout=30):
+    """Wait for results, a no-records message or a new CAPTCHA; None on timeout."""
+    def outcome(d):
+        state = d.execute_script(_POLL_JS)
+        if state["t"] != "wait":
+            return state
+        
+        # A new CAPTCHA image means the submitted solution was rejected
+        try:
+            current_hash = get_captcha_fingerprint(d, use_pixels)
+            if current_hash is not None and current_hash != captcha_hash:
+                return {"t": "changed"}
+        except WebDriverException:
+            pass
+        return False
+    
     try:
-        with open(image_path, "rb") as f:
-            return hashlib.md5(f.read()).hexdigest()
-    except Exception as e:
-        logger.error(f"Failed to hash CAPTCHA image: {str(e)}")
-        return ""
+        return WebDriverWait(driver, timeout, poll_frequency=0.25).until(outcome)
+    except TimeoutException:
+        return None
 
 def solve_and_submit_captcha(driver, property_no, max_attempts=8):
     """Solves and submits the CAPTCHA with improved error handling and more retries."""
     
-    # Take a screenshot of initial state
     os.makedirs("temp_captchas", exist_ok=True)
-    driver.save_screenshot("temp_captchas/initial_state.png")
+    if DEBUG_SCREENSHOTS:
+        driver.save_screenshot("temp_captchas/initial_state.png")
+    
+    # Screenshots of the latest failed attempts, written out only if every attempt fails
+    error_screenshots = deque(maxlen=3)
     
     # First check ONLY for document links, ignore RegistrationGrid
-    index_buttons = driver.find_elements(By.XPATH, "//td/input[@value='IndexII']")
-    if index_buttons:
-        logger.info(f"Found {len(index_buttons)} document links already - no CAPTCHA needed")
+    state = driver.execute_script(_POLL_JS)
+    if state["t"] == "docs":
+        logger.info(f"Found {state['n']} document links already - no CAPTCHA needed")
         return True
         
     # Check for "No Records Found" message
-    if "No Records Found" in driver.page_source:
+    if state["t"] == "none":
         logger.info("No records found message detected initially")
         return "NO_RECORDS"
     
@@ -136,18 +345,16 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             logger.info(f"CAPTCHA attempt {attempt+1}/{max_attempts}")
             
             # Look for CAPTCHA element
-            captcha_elements = driver.find_elements(By.ID, "imgCaptcha_new")
+            captcha_elements = driver.find_elements(By.ID, _ID_CAPTCHA)
             if not captcha_elements:
                 logger.warning("CAPTCHA element not found, checking for results anyway")
                 
-                # Check for document links
-                index_buttons = driver.find_elements(By.XPATH, "//td/input[@value='IndexII']")
-                if index_buttons:
-                    logger.info(f"Found {len(index_buttons)} document links")
+                # Check for document links or "No Records Found" message
+                state = driver.execute_script(_POLL_JS)
+                if state["t"] == "docs":
+                    logger.info(f"Found {state['n']} document links")
                     return True
-                    
-                # Check for "No Records Found" message
-                if "No Records Found" in driver.page_source:
+                if state["t"] == "none":
                     logger.info("No records found message detected")
                     return "NO_RECORDS"
                 
@@ -155,14 +362,20 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
                 time.sleep(3)
                 continue
             
-            # Take screenshot of CAPTCHA and get its hash
+            # Take screenshot of CAPTCHA once; hash and OCR the same bytes
             captcha_element = captcha_elements[0]
-            captcha_image_path = os.path.join("temp_captchas", f"captcha_attempt_{attempt}.png")
-            captcha_element.screenshot(captcha_image_path)
-            captcha_hash = get_captcha_hash(captcha_image_path)
+            captcha_png = captcha_element.screenshot_as_png
+            captcha_hash = get_captcha_fingerprint(driver)
+            use_pixels = captcha_hash is not None
+            if not use_pixels:
+                # Canvas unreadable (still decoding or cross-origin): compare screenshots for this attempt
+                captcha_hash = get_captcha_hash(captcha_png)
+            if DEBUG_SCREENSHOTS:
+                with open(os.path.join("temp_captchas", f"captcha_attempt_{attempt}.png"), "wb") as f:
+                    f.write(captcha_png)
             
             # Solve CAPTCHA
-            captcha_text = solve_captcha_with_multiple_techniques(captcha_image_path)
+            captcha_text = solve_captcha_with_multiple_techniques(Image.open(BytesIO(captcha_png)))
             
             if not captcha_text:
                 logger.warning(f"Empty CAPTCHA solution on attempt {attempt+1}")
@@ -173,13 +386,8 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             
             # Before entering, verify CAPTCHA hasn't changed
             try:
-                current_captcha_elements = driver.find_elements(By.ID, "imgCaptcha_new")
-                if current_captcha_elements:
-                    current_captcha = current_captcha_elements[0]
-                    current_path = os.path.join("temp_captchas", f"captcha_current_{attempt}.png")
-                    current_captcha.screenshot(current_path)
-                    current_hash = get_captcha_hash(current_path)
-                    
+                current_hash = get_captcha_fingerprint(driver, use_pixels)
+                if current_hash is not None:
                     if current_hash != captcha_hash:
                         logger.info("CAPTCHA changed before entering solution, retrying...")
                         continue
@@ -188,12 +396,12 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             
             # Enter property number and CAPTCHA
             try:
-                property_input = driver.find_element(By.ID, "txtAttributeValue1")
+                property_input = driver.find_element(By.ID, _ID_PROPERTY_INPUT)
                 property_input.clear()
                 property_input.send_keys(property_no)
                 logger.info(f"Property number '{property_no}' entered")
                 
-                captcha_input = driver.find_element(By.ID, "txtImg1")
+                captcha_input = driver.find_element(By.ID, _ID_CAPTCHA_INPUT)
                 captcha_input.clear()
                 captcha_input.send_keys(captcha_text)
             except Exception as e:
@@ -202,13 +410,8 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             
             # Verify CAPTCHA hasn't changed before clicking search
             try:
-                current_captcha_elements = driver.find_elements(By.ID, "imgCaptcha_new")
-                if current_captcha_elements:
-                    current_captcha = current_captcha_elements[0]
-                    current_path = os.path.join("temp_captchas", f"captcha_before_click_{attempt}.png")
-                    current_captcha.screenshot(current_path)
-                    current_hash = get_captcha_hash(current_path)
-                    
+                current_hash = get_captcha_fingerprint(driver, use_pixels)
+                if current_hash is not None:
                     if current_hash != captcha_hash:
                         logger.info("CAPTCHA changed after entering solution but before clicking search, retrying...")
                         continue
@@ -217,7 +420,7 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             
             # Click search button
             try:
-                search_buttons = driver.find_elements(By.ID, "btnSearch_RestMaha")
+                search_buttons = driver.find_elements(By.ID, _ID_SEARCH_BUTTON)
                 if not search_buttons:
                     logger.warning("Search button not found")
                     continue
@@ -236,48 +439,26 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             
             # Wait up to 30 seconds
             start_time = time.time()
+            state = _wait_for_search_outcome(driver, captcha_hash, use_pixels)
             
-            while time.time() - start_time < 30:
-                # Check for document links
-                index_buttons = driver.find_elements(By.XPATH, "//td/input[@value='IndexII']")
-                if index_buttons:
-                    logger.info(f"Found {len(index_buttons)} document links after {int(time.time() - start_time)} seconds")
-                    return True
-                
-                # Check for "No Records Found"
-                if "No Records Found" in driver.page_source:
-                    logger.info("No records found message displayed")
-                    return "NO_RECORDS"
-                
-                # Check if CAPTCHA changed (indicating incorrect solution)
-                current_captcha_elements = driver.find_elements(By.ID, "imgCaptcha_new")
-                if current_captcha_elements:
-                    try:
-                        current_captcha = current_captcha_elements[0]
-                        current_path = os.path.join("temp_captchas", f"captcha_during_wait_{attempt}.png")
-                        current_captcha.screenshot(current_path)
-                        current_hash = get_captcha_hash(current_path)
-                        
-                        if current_hash != captcha_hash:
-                            logger.info("CAPTCHA changed during wait (incorrect solution)")
-                            break  # Break out of wait loop, try next CAPTCHA
-                    except:
-                        pass
-                
-                # Take progress screenshots every 5 seconds
-                if int(time.time() - start_time) % 5 == 0:
-                    driver.save_screenshot(f"temp_captchas/waiting_{attempt}_{int(time.time() - start_time)}.png")
-                
-                time.sleep(1)
+            if state is None:
+                if DEBUG_SCREENSHOTS:
+                    driver.save_screenshot(f"temp_captchas/waiting_{attempt}_timeout.png")
+            elif state["t"] == "docs":
+                logger.info(f"Found {state['n']} document links after {int(time.time() - start_time)} seconds")
+                return True
+            elif state["t"] == "none":
+                logger.info("No records found message displayed")
+                return "NO_RECORDS"
+            else:
+                logger.info("CAPTCHA changed during wait (incorrect solution)")
             
             # After waiting, check one more time for results
-            index_buttons = driver.find_elements(By.XPATH, "//td/input[@value='IndexII']")
-            if index_buttons:
-                logger.info(f"Found {len(index_buttons)} document links after wait")
+            state = driver.execute_script(_POLL_JS)
+            if state["t"] == "docs":
+                logger.info(f"Found {state['n']} document links after wait")
                 return True
-                
-            # Check for "No Records Found" again
-            if "No Records Found" in driver.page_source:
+            if state["t"] == "none":
                 logger.info("No records found message detected after wait")
                 return "NO_RECORDS"
                 
@@ -285,27 +466,30 @@ def solve_and_submit_captcha(driver, property_no, max_attempts=8):
             
         except Exception as e:
             logger.error(f"Error during CAPTCHA attempt {attempt+1}: {str(e)}")
-            driver.save_screenshot(f"temp_captchas/error_captcha_{attempt+1}.png")
+            error_screenshots.append((attempt + 1, driver.get_screenshot_as_png()))
             
             # Even after error, check for results
-            index_buttons = driver.find_elements(By.XPATH, "//td/input[@value='IndexII']")
-            if index_buttons:
-                logger.info(f"Found {len(index_buttons)} document links despite error")
+            state = driver.execute_script(_POLL_JS)
+            if state["t"] == "docs":
+                logger.info(f"Found {state['n']} document links despite error")
                 return True
             
             time.sleep(2)  # Delay before next attempt
     
     # After all attempts, check one more time for results
-    index_buttons = driver.find_elements(By.XPATH, "//td/input[@value='IndexII']")
-    if index_buttons:
-        logger.info(f"Found {len(index_buttons)} document links after all attempts")
+    state = driver.execute_script(_POLL_JS)
+    if state["t"] == "docs":
+        logger.info(f"Found {state['n']} document links after all attempts")
         return True
         
     # Check for "No Records Found" one final time
-    if "No Records Found" in driver.page_source:
+    if state["t"] == "none":
         logger.info("No records found message detected at end")
         return "NO_RECORDS"
         
     logger.error("All CAPTCHA attempts failed")
+    for failed_attempt, png in error_screenshots:
+        with open(f"temp_captchas/error_captcha_{failed_attempt}.png", "wb") as f:
+            f.write(png)
     return False
             
\ No newline at end of file
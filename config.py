@@ -1,10 +1,18 @@
 # config.py
 import os
-import logging
 import sys
 import json
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import platform
-from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib parser is the fallback
+    orjson = None
 
 # Base paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,30 +25,39 @@ os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 TIMEOUT = 30  # seconds
 MAX_RETRIES = 3
 WEBDRIVER_POOL_SIZE = 3
+DOCUMENT_WORKERS = int(os.environ.get('IGR_DOCUMENT_WORKERS', '1'))  # Browsers capturing documents of a results page in parallel (1 = serial)
+HTTP_PAGINATION = os.environ.get('IGR_HTTP_PAGINATION', '0') == '1'  # Count result pages over HTTP up front for progress reporting (one extra POST per page)
+HTTP_DOCUMENTS = os.environ.get('IGR_HTTP_DOCUMENTS', '0') == '1'  # Fetch IndexII documents over HTTP and render them with wkhtmltopdf
+RETRY_INEFFECTIVE_CLICKS = os.environ.get('IGR_RETRY_INEFFECTIVE_CLICKS', '0') == '1'  # Try other click methods after one ran without effect
+TEXT_ONLY_PDF = os.environ.get('IGR_TEXT_ONLY_PDF', '0') == '1'  # Leave images out of saved documents so they load faster
+DEBUG_SCREENSHOTS = os.environ.get('IGR_DEBUG_SCREENSHOTS', '0') == '1'  # Save progress screenshots for troubleshooting
+CAPTCHA_LENGTH = int(os.environ.get('IGR_CAPTCHA_LENGTH', '0')) or None  # Enables per-character OCR when the length is fixed
 
 def setup_logging():
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    """Configure root logging once; later calls are no-ops."""
+    if logging.getLogger().handlers:
+        return
+    
+    # Records are queued and written by a background listener thread so that
+    # file and console I/O never stalls the automation threads.
+    log_queue = queue.Queue(-1)
+    log_listener = QueueListener(
+        log_queue,
+        logging.FileHandler("igr_automation.log", encoding='utf-8', delay=True),
+        logging.StreamHandler(sys.stdout)  # This will use the system's default encoding
+    )
     logging.basicConfig(
         level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(f"logs_{datetime.now().strftime('%Y%m%d')}.log"),
-            logging.StreamHandler()
-        ]
+        format='%(asctime)s - %(levelname)s - %(threadName)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
     )
+    log_listener.start()
+    atexit.register(log_listener.stop)  # Flush queued records on shutdown
 
-# Configure logging with a more detailed format and proper encoding
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(threadName)s - %(message)s',
-    handlers=[
-        logging.FileHandler("igr_automation.log", encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)  # This will use the system's default encoding
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Configure paths based on OS
+# Configure paths based on OS; the answer can't change while running, so compute it once
+@lru_cache(maxsize=1)
 def get_tesseract_path():
     """Return the path to Tesseract OCR executable based on OS."""
     if platform.system() == 'Windows':
@@ -50,6 +67,7 @@ def get_tesseract_path():
     else:  # macOS
         return "/usr/local/bin/tesseract"
 
+@lru_cache(maxsize=1)
 def get_wkhtmltopdf_path():
     """Return the path to wkhtmltopdf executable based on OS."""
     if platform.system() == 'Windows':
@@ -59,26 +77,39 @@ def get_wkhtmltopdf_path():
     else:  # macOS
         return '/usr/local/bin/wkhtmltopdf'
 
-# Load location data with proper error handling
-try:
-    with open('maharashtra_locations_final.json', 'r', encoding='utf-8') as f:
-        location_data = json.load(f)
-        
-    # Create location data structures
-    districts_data = list(location_data.keys())
-    
-    # Create tahsil_data dictionary
-    tahsil_data = {district: list(tahsils_data.keys()) for district, tahsils_data in location_data.items()}
+# Location data is loaded on first access (PEP 562) so importers that only
+# need settings don't pay for parsing the JSON file
+LOCATIONS_FILE = os.path.join(BASE_DIR, 'maharashtra_locations_final.json')
+_LOCATION_NAMES = ('location_data', 'districts_data', 'tahsil_data', 'village_data')
+
+def _load_location_data():
+    """Parse the locations file and build the district/tahsil/village lookups."""
+    try:
+        with open(LOCATIONS_FILE, 'rb') as f:
+            raw = f.read()
+        location_data = orjson.loads(raw) if orjson else json.loads(raw)
+    except (FileNotFoundError, ValueError) as e:
+        logger.critical(f"Failed to load location data: {str(e)}")
+        location_data = {}
     
-    # Create village_data dictionary
+    # Build tahsil and village lookups in a single pass
+    tahsil_data = {}
     village_data = {}
     for district, tahsils_data in location_data.items():
+        tahsil_data[district] = list(tahsils_data.keys())
         for tahsil, villages in tahsils_data.items():
             village_data[tahsil] = villages
-            
-except (FileNotFoundError, json.JSONDecodeError) as e:
-    logger.critical(f"Failed to load location data: {str(e)}")
-    location_data = {}
-    districts_data = []
-    tahsil_data = {}
-    village_data = {}
\ No newline at end of file
+    
+    return {
+        'location_data': location_data,
+        'districts_data': list(location_data.keys()),
+        'tahsil_data': tahsil_data,
+        'village_data': village_data,
+    }
+
+def __getattr__(name):
+    if name in _LOCATION_NAMES:
+        # Cache on the module so later lookups bypass __getattr__
+        globals().update(_load_location_data())
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,14 @@
 import os
-import time
 import logging
-import hashlib
-import base64
 import re
+import queue
+import weakref
+from functools import lru_cache, partial
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import (
     TimeoutException, 
     StaleElementReferenceException, 
@@ -16,112 +17,417 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException,
     JavascriptException
 )
+from config import (HTTP_PAGINATION, HTTP_DOCUMENTS, DOCUMENT_WORKERS, DEBUG_SCREENSHOTS, TEXT_ONLY_PDF,
+                    RETRY_INEFFECTIVE_CLICKS)
+from postback_client import scan_result_pages, capture_form_state, PostbackClient, download_document
+from utils import update_job, save_error_screenshot, save_debug_screenshot
+from webdriver_pool import block_urls, DOCUMENT_BLOCKED_URL_PATTERNS
+
+try:
+    from pybase64 import b64decode as _b64decode  # SIMD-accelerated decoder
+except ImportError:  # pybase64 is optional; the stdlib decoder is the fallback
+    from base64 import b64decode as _b64decode
 
 logger = logging.getLogger(__name__)
 
+# CSS locators; Chrome answers these with native querySelectorAll instead of its XPath engine
+_INDEXII_CSS = "input[value='IndexII']"
+_PAGER_LINK_CSS = "a[href*=\"__doPostBack('RegistrationGrid','Page$\"]"
+
+# ASP.NET postback call in an onclick attribute, and the page number in a pager link
+_POSTBACK_RE = re.compile(r"__doPostBack\('([^']+)',\s*'([^']+)'\)")
+_PAGE_RE = re.compile(r"Page\$(\d+)")
+_INDEXII_RE = re.compile(r"indexII\$(\d+)")
+
+# Last page number read per driver, keyed by the results grid element it was read from
+_page_number_cache = weakref.WeakKeyDictionary()
+
+# Explicit waits poll faster than Selenium's 0.5 s default
+_POLL_FREQUENCY = 0.2
+
+# A document click shows its effect within a couple of seconds; rows that do nothing shouldn't cost more
+_CLICK_EFFECT_TIMEOUT = 3
+
+# Every write is already a large decoded block, so files skip Python's copy into a write buffer
+_UNBUFFERED = 0
+
+# A4 page with small margins; the PDF is streamed back rather than returned as one base64 string
+_PDF_OPTIONS = {
+    'printBackground': True,
+    'paperWidth': 8.27,
+    'paperHeight': 11.69,
+    'marginTop': 0.4,
+    'marginBottom': 0.4,
+    'scale': 1.0,
+    'transferMode': 'ReturnAsStream'
+}
+
+# Whole-page JPEG for documents that cannot be printed; far smaller than a viewport PNG
+_DOCUMENT_SCREENSHOT_OPTIONS = {'format': 'jpeg', 'quality': 85, 'captureBeyondViewport': True}
+
+# Results page markers (IndexII button, pager link or grid) checked in one round trip
+_RESULTS_PAGE_JS = """
+return !!(document.querySelector("input[value='IndexII']")
+    || document.querySelector("a[href*=\\"__doPostBack('RegistrationGrid','Page$\\"]")
+    || document.getElementById('RegistrationGrid'));
+"""
+
+# Centre an element only when it is outside the viewport; the scroll is synchronous
+_SCROLL_IF_NEEDED_JS = """
+var r = arguments[0].getBoundingClientRect();
+if (r.top < 0 || r.bottom > window.innerHeight) {
+    arguments[0].scrollIntoView({block: 'center'});
+}
+"""
+
+# onclick attribute of every IndexII button, in page order
+_INDEXII_ONCLICKS_JS = """
+return Array.from(document.querySelectorAll("input[value='IndexII']")).map(function(b) {
+    return b.getAttribute('onclick') || '';
+});
+"""
+
+# Loaded results page: document complete and IndexII buttons rendered
+_PAGE_READY_JS = """
+return document.readyState === 'complete' && !!document.querySelector("input[value='IndexII']");
+"""
+
+# Current pager page as [source, text]: the unlinked span, else the link styled as selected
+_CURRENT_PAGE_JS = r"""
+var spans = document.querySelectorAll('tr.GridPager > td > span');
+for (var i = 0; i < spans.length; i++) {
+    var text = spans[i].textContent.trim();
+    if (/^\d+$/.test(text)) { return ['span tag', text]; }
+}
+var links = document.querySelectorAll('tr.GridPager > td > a');
+for (var j = 0; j < links.length; j++) {
+    var linkText = links[j].textContent.trim();
+    if ((links[j].getAttribute('style') || '').indexOf('color:White') !== -1 && /^\d+$/.test(linkText)) {
+        return ['styled link', linkText];
+    }
+}
+return null;
+"""
+
+# Lowest pager target above the current page, parsed in the browser in one round trip
+_NEXT_HIGHER_PAGE_JS = r"""
+var current = arguments[0];
+var pages = Array.from(document.querySelectorAll("a[href*=\"__doPostBack('RegistrationGrid','Page$\"]"))
+    .map(function(a) { var m = a.getAttribute('href').match(/Page\$(\d+)/); return m ? parseInt(m[1], 10) : 0; })
+    .filter(function(n) { return n > current; });
+return pages.length ? Math.min.apply(null, pages) : null;
+"""
+
+
+# Visible text and href of each pager link, fetched together in one round trip
+_LINK_TEXT_HREF_JS = """
+return arguments[0].map(function(a) { return [(a.innerText || '').trim(), a.getAttribute('href') || '']; });
+"""
+
+# Submit a postback using form state captured from another browser
+_REPLAY_POSTBACK_JS = """
+var form = document.createElement('form');
+form.method = 'post';
+form.action = arguments[0];
+arguments[1].forEach(function(field) {
+    var input = document.createElement('input');
+    input.type = 'hidden';
+    input.name = field[0];
+    input.value = field[1];
+    form.appendChild(input);
+});
+document.body.appendChild(form);
+HTMLFormElement.prototype.submit.call(form);
+"""
+
+def wait_for(driver, timeout=10):
+    """Return a WebDriverWait that polls every 0.2 s; results pages respond in well under a second.
+    
+    Waits keep no state between until() calls, so one per driver and timeout is
+    created and then reused from an attribute on the driver.
+    """
+    waits = driver.__dict__.setdefault('_igr_waits', {})
+    wait = waits.get(timeout)
+    if wait is None:
+        wait = waits[timeout] = WebDriverWait(driver, timeout, poll_frequency=_POLL_FREQUENCY)
+    return wait
+
+def pdf_printer(driver):
+    """Return the driver's Page.printToPDF command bound to the shared A4 options, created once per driver."""
+    printer = driver.__dict__.get('_igr_print_to_pdf')
+    if printer is None:
+        printer = driver.__dict__['_igr_print_to_pdf'] = partial(
+            driver.execute_cdp_cmd, 'Page.printToPDF', _PDF_OPTIONS)
+    return printer
+
+@lru_cache(maxsize=256)
+def parse_postback(onclick):
+    """Return the (target, argument) of a __doPostBack onclick, or None; buttons are re-read after every refresh."""
+    match = _POSTBACK_RE.search(onclick or "")
+    return match.groups() if match else None
+
+def has_index_buttons(driver):
+    """Check for IndexII buttons in the browser instead of transferring page_source."""
+    return driver.execute_script("return !!document.querySelector(\"input[value='IndexII']\");")
+
+def write_base64(out_file, data, chunk_size=1 << 20):
+    """Decode base64 text into out_file a chunk at a time instead of all at once."""
+    # chunk_size must be a multiple of 4 so every slice is independently decodable
+    for start in range(0, len(data), chunk_size):
+        out_file.write(_b64decode(data[start:start + chunk_size]))
+
+def print_to_pdf_file(driver, pdf_path):
+    """
+    Print the current page to pdf_path, streaming the PDF from Chrome.
+    
+    With transferMode ReturnAsStream, printToPDF returns a stream handle instead
+    of the whole document as one base64 string, so the file is written in chunks.
+    
+    Args:
+        driver: WebDriver instance showing the page to print
+        pdf_path: Destination file path
+    """
+    result = pdf_printer(driver)()
+    handle = result.get('stream')
+    if handle is None:
+        # Browser ignored transferMode and returned the data inline
+        with open(pdf_path, 'wb', buffering=_UNBUFFERED) as pdf_file:
+            write_base64(pdf_file, result['data'])
+        return
+    
+    try:
+        with open(pdf_path, 'wb', buffering=_UNBUFFERED) as pdf_file:
+            while True:
+                chunk = driver.execute_cdp_cmd('IO.read', {'handle': handle, 'size': 1 << 20})
+                if chunk.get('base64Encoded'):
+                    pdf_file.write(_b64decode(chunk['data']))
+                else:
+                    pdf_file.write(chunk['data'].encode('latin-1'))
+                if chunk.get('eof'):
+                    break
+    finally:
+        driver.execute_cdp_cmd('IO.close', {'handle': handle})
+
+def save_document_screenshot(driver, path):
+    """Save the whole page as a JPEG through CDP instead of Selenium's viewport PNG."""
+    data = driver.execute_cdp_cmd('Page.captureScreenshot', _DOCUMENT_SCREENSHOT_OPTIONS)
+    with open(path, 'wb', buffering=_UNBUFFERED) as image_file:
+        image_file.write(_b64decode(data['data']))
+
+def save_current_page_as_pdf(driver, pdf_path, image_path):
+    """
+    Save the current page as a PDF, falling back to a JPEG screenshot.
+    
+    Args:
+        driver: WebDriver instance showing the page to save
+        pdf_path: Destination file path for the PDF
+        image_path: Destination file path for the fallback screenshot
+    
+    Returns:
+        bool: True if the PDF was saved, False if the screenshot was used instead
+    """
+    try:
+        print_to_pdf_file(driver, pdf_path)
+        return True
+    except Exception as pdf_error:
+        logger.warning(f"PDF generation failed: {str(pdf_error)}")
+        save_document_screenshot(driver, image_path)
+        return False
+
+def document_path_prefix(output_dir, page_number):
+    """Return the joined path shared by every document file of a results page; callers append '<number>.pdf'."""
+    return os.path.join(output_dir, f"Document-P{page_number}-")
+
+def save_document_pdf(driver, output_dir, page_number, document_number):
+    """
+    Save the page the driver shows as Document-P<page>-<number>.pdf, or as a JPEG if printing fails.
+    
+    Args:
+        driver: WebDriver instance showing the document
+        output_dir: Directory to save the document in
+        page_number: Results page the document was opened from
+        document_number: Document number for naming
+    
+    Returns:
+        bool: True once the document is on disk in either format
+    """
+    base_path = f"{document_path_prefix(output_dir, page_number)}{document_number}"
+    if save_current_page_as_pdf(driver, f"{base_path}.pdf", f"{base_path}.jpg"):
+        logger.info(f"Document {document_number} saved to {base_path}.pdf")
+    else:
+        logger.info(f"Saved screenshot instead at {base_path}.jpg")
+    return True
+
+def wait_for_postback_result(driver, original_handles, original_url, timeout=10):
+    """
+    Wait until a document postback opens a tab, changes the URL or leaves the results page.
+    
+    Returns:
+        tuple: The window handles and URL read when the wait ended, so callers
+        need not ask the browser again, and whether this tab has left the results
+        page (new URL, or a document rendered in place at the same URL)
+    """
+    def changed(d):
+        handles = d.window_handles
+        url = d.current_url
+        left_results = url != original_url or not has_index_buttons(d)
+        if len(handles) > len(original_handles) or left_results:
+            return handles, url, left_results
+        return False
+    
+    try:
+        return wait_for(driver, timeout).until(changed)
+    except TimeoutException:
+        logger.warning(f"No new tab or page change within {timeout} seconds of postback")
+        return original_handles, original_url, False
+
+def close_new_tabs(driver, original_handles, original_handle):
+    """Close the tabs opened since original_handles was read, reading window_handles only once, and switch back."""
+    for handle in driver.window_handles:
+        if handle not in original_handles:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except WebDriverException:
+                logger.warning("Failed to close extra tab during error recovery")
+    driver.switch_to.window(original_handle)
+
+def postback_and_wait(driver, target, argument, timeout=15):
+    """Run a pager __doPostBack(target, argument) and wait until the results grid it re-renders is replaced.
+
+    Partial (UpdatePanel) and full postbacks both detach the old grid element, so
+    unrelated DOM changes such as the progress spinner don't end the wait early.
+    """
+    grid = find_results_grid(driver)
+    driver.execute_script("__doPostBack(arguments[0], arguments[1]);", target, argument)
+    wait_for_grid_replaced(driver, grid, timeout)
+
+def wait_for_grid_replaced(driver, grid, timeout=15):
+    """Wait until the results grid element captured before a pager postback is gone."""
+    if grid is None:
+        return
+    try:
+        wait_for(driver, timeout).until(EC.staleness_of(grid))
+    except TimeoutException:
+        logger.warning(f"Results grid was not replaced within {timeout} seconds")
+
+def find_results_grid(driver):
+    """Return the RegistrationGrid element, or None if it isn't on the page."""
+    grids = driver.find_elements(By.ID, "RegistrationGrid")
+    return grids[0] if grids else None
+
+def wait_for_results_buttons(driver, timeout=10):
+    """Wait for IndexII buttons to be present; True if they appeared in time."""
+    try:
+        wait_for(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, _INDEXII_CSS))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def has_later_page_link(driver, current_page):
+    """Check the browser's pager for a link past current_page, including '...' links."""
+    hrefs = driver.execute_script(
+        "return Array.from(document.querySelectorAll(arguments[0])).map(a => a.getAttribute('href') || '');",
+        _PAGER_LINK_CSS)
+    return any(int(match.group(1)) > current_page for match in map(_PAGE_RE.search, hrefs) if match)
+
+def switch_to_document_tab(driver, handle):
+    """
+    Switch to a tab opened by a document postback.
+    
+    Network.setBlockedURLs only covers the tab it is sent to, so text-only runs
+    block images again in every document tab. Requests the tab started before
+    the switch still complete; images requested later are skipped.
+    """
+    driver.switch_to.window(handle)
+    if TEXT_ONLY_PDF:
+        block_urls(driver, DOCUMENT_BLOCKED_URL_PATTERNS)
+
+def wait_for_document_ready(driver, timeout=15):
+    """Wait until document.readyState is 'complete'; raises TimeoutException if it never is."""
+    wait_for(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+def reload_results_page(driver, timeout=10):
+    """Reload the page and wait only as long as the IndexII buttons take to return; True if they did."""
+    driver.refresh()
+    return wait_for_results_buttons(driver, timeout)
+
+def return_to_results(driver, timeout=10):
+    """
+    Step back from a document shown in the results tab; True once the IndexII buttons are back.
+    
+    history.back() lets Chrome restore the results page from its back/forward cache
+    instead of resubmitting the search, and returns at once so the wait below ends
+    as soon as the buttons are there. A reload is only the fallback.
+    """
+    driver.execute_script("window.history.back();")
+    if wait_for_results_buttons(driver, timeout):
+        return True
+    logger.warning("Back navigation didn't return to results, refreshing")
+    return reload_results_page(driver, timeout)
+
 def process_index_button(driver, button, document_number, output_dir, debug_dir):
     """Simplified and more reliable approach to process IndexII buttons"""
-    original_handles = driver.window_handles
+    original_handles = frozenset(driver.window_handles)
+    original_handle = driver.current_window_handle
     original_url = driver.current_url
     
     try:
         # Extract onclick attribute for direct JavaScript execution
         onclick = button.get_attribute("onclick")
-        match = re.search(r"__doPostBack\('([^']+)',\s*'([^']+)'\)", onclick)
+        postback = parse_postback(onclick)
         
-        if match:
-            target, argument = match.groups()
+        if postback:
+            target, argument = postback
             logger.info(f"Clicking IndexII button for doc {document_number} using __doPostBack")
             
             # Execute JavaScript directly - most reliable for ASP.NET
-            driver.execute_script(f"__doPostBack('{target}', '{argument}')")
+            driver.execute_script("__doPostBack(arguments[0], arguments[1]);", target, argument)
             
-            # Wait briefly for any new tab or page change
-            time.sleep(3)
+            # Wait for any new tab or page change, and use what the wait saw
+            new_handles, _, left_results = wait_for_postback_result(driver, original_handles, original_url)
             
             # Check if new tab opened
-            new_handles = driver.window_handles
-            if len(new_handles) > len(original_handles):
+            new_handle = next((h for h in new_handles if h not in original_handles), None)
+            if new_handle:
                 # Switch to new tab
-                new_handle = [h for h in new_handles if h not in original_handles][0]
-                driver.switch_to.window(new_handle)
+                switch_to_document_tab(driver, new_handle)
                 
                 # Wait for document to load
                 try:
-                    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    time.sleep(2)  # Additional wait for stability
+                    wait_for_document_ready(driver)
                     
                     # Save document as PDF
-                    pdf_path = os.path.join(output_dir, f"Document-{document_number}.pdf")
-                    
-                    try:
-                        # Use printToPDF command for better PDF generation
-                        pdf_options = {
-                            'printBackground': True,
-                            'paperWidth': 8.27,
-                            'paperHeight': 11.69,
-                            'marginTop': 0.4,
-                            'marginBottom': 0.4,
-                            'scale': 1.0
-                        }
-                        pdf_data = driver.execute_cdp_cmd('Page.printToPDF', pdf_options)
-                        
-                        with open(pdf_path, 'wb') as pdf_file:
-                            pdf_file.write(base64.b64decode(pdf_data['data']))
-                        
+                    if save_current_page_as_pdf(driver, os.path.join(output_dir, f"Document-{document_number}.pdf"),
+                                                os.path.join(output_dir, f"Document-{document_number}.jpg")):
                         logger.info(f"Document {document_number} saved as PDF")
                         
-                    except Exception as pdf_error:
-                        logger.warning(f"PDF generation failed: {str(pdf_error)}")
-                        # Fallback to screenshot
-                        driver.save_screenshot(os.path.join(output_dir, f"Document-{document_number}.png"))
-                        
                 except Exception as e:
                     logger.error(f"Error loading document: {str(e)}")
                     
                 # Close tab and return to original
                 driver.close()
-                driver.switch_to.window(original_handles[0])
+                driver.switch_to.window(original_handle)
                 return True
                 
             # Check if page changed without opening a new tab
-            elif driver.current_url != original_url or "IndexII" not in driver.page_source:
+            elif left_results:
                 logger.info(f"Page changed for document {document_number} (no new tab)")
                 
-                # Save current page as document
-                pdf_path = os.path.join(output_dir, f"Document-{document_number}.pdf")
+                # The driver loads eagerly, so let the document finish before printing it
+                wait_for_document_ready(driver)
                 
-                try:
-                    # Use printToPDF command
-                    pdf_options = {
-                        'printBackground': True,
-                        'paperWidth': 8.27,
-                        'paperHeight': 11.69,
-                        'marginTop': 0.4,
-                        'marginBottom': 0.4,
-                        'scale': 1.0
-                    }
-                    pdf_data = driver.execute_cdp_cmd('Page.printToPDF', pdf_options)
-                    
-                    with open(pdf_path, 'wb') as pdf_file:
-                        pdf_file.write(base64.b64decode(pdf_data['data']))
-                    
+                # Save current page as document
+                if save_current_page_as_pdf(driver, os.path.join(output_dir, f"Document-{document_number}.pdf"),
+                                            os.path.join(output_dir, f"Document-{document_number}.jpg")):
                     logger.info(f"Document {document_number} saved as PDF")
-                    
-                except Exception as pdf_error:
-                    logger.warning(f"PDF generation failed: {str(pdf_error)}")
-                    # Fallback to screenshot
-                    driver.save_screenshot(os.path.join(output_dir, f"Document-{document_number}.png"))
-                
-                # Navigate back
-                driver.back()
-                time.sleep(3)
                 
-                # Verify we're back on results page
-                if "IndexII" not in driver.page_source:
-                    logger.warning("Back navigation didn't return to results, refreshing")
-                    driver.refresh()
-                    time.sleep(3)
+                # Navigate back to the results page
+                return_to_results(driver)
                 
                 return True
             
@@ -133,7 +439,7 @@ def process_index_button(driver, button, document_number, output_dir, debug_dir)
             # Fallback to regular click if no __doPostBack
             logger.warning("No __doPostBack found in onclick, using regular click")
             button.click()
-            time.sleep(3)
+            wait_for_postback_result(driver, original_handles, original_url)
             
             # Similar checks as above for new tab or page change
             # (Code omitted for brevity)
@@ -142,7 +448,7 @@ def process_index_button(driver, button, document_number, output_dir, debug_dir)
         logger.error(f"Error processing document {document_number}: {str(e)}")
         return False
 
-def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=None):
+def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=None, driver_pool=None):
     """
     Process all IndexII buttons across all pages with better page tracking.
     
@@ -152,6 +458,7 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
         debug_dir: Directory for debug screenshots and logs
         job_id: Optional job ID for tracking in jobs dictionary
         jobs: Optional jobs dictionary for status updates
+        driver_pool: Optional WebDriverPool supplying extra browsers for parallel capture
     
     Returns:
         dict: Processing summary
@@ -159,9 +466,11 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
     # Ensure directories exist
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(debug_dir, exist_ok=True)
+    debug_path = Path(debug_dir)
     
     # Take initial screenshot
-    driver.save_screenshot(os.path.join(debug_dir, "initial_page.png"))
+    if DEBUG_SCREENSHOTS:
+        save_debug_screenshot(driver, str(debug_path / "initial_page.png"))
     
     # Initialize tracking variables
     processed_document_hashes = set()  # Not used but kept for compatibility
@@ -177,6 +486,15 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
     else:
         logger.info(f"Starting processing from page {current_page}")
     
+    # Count the remaining pages over HTTP for progress reporting; the browser's pager still decides when to stop
+    last_page = None
+    if HTTP_PAGINATION:
+        page_counts = scan_result_pages(driver, current_page)
+        if page_counts:
+            last_page = max(page_counts)
+            if job_id and jobs:
+                update_job(jobs, job_id, total_documents=sum(page_counts.values()))
+    
     # Set safety limits
     max_pages = 100  # Maximum number of pages to process
     max_attempts_per_page = 2  # Maximum attempts per page
@@ -192,7 +510,8 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
         logger.info(f"Processing page {current_page} (iteration {iteration})")
         
         # Take screenshot at start of iteration
-        driver.save_screenshot(os.path.join(debug_dir, f"iteration_{iteration}_page_{current_page}.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, str(debug_path / f"iteration_{iteration}_page_{current_page}.png"))
         
         # Check if we've already processed this page too many times
         page_attempts[current_page] = page_attempts.get(current_page, 0) + 1
@@ -234,7 +553,8 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
             debug_dir,
             processed_document_hashes,
             set(),  # Empty set for button identifiers (not used)
-            documents_processed
+            documents_processed,
+            driver_pool
         )
         
         # Mark this page as processed
@@ -250,16 +570,23 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
         # Update job status if tracking enabled
         if job_id and jobs:
             try:
-                jobs[job_id].update({
-                    "processed_documents": documents_processed,
-                    "downloaded_documents": documents_downloaded,
-                    "current_page": current_page
-                })
+                update_job(
+                    jobs, job_id,
+                    processed_documents=documents_processed,
+                    downloaded_documents=documents_downloaded,
+                    current_page=current_page
+                )
             except Exception as job_error:
                 logger.error(f"Error updating job status: {str(job_error)}")
         
         # Take screenshot after processing
-        driver.save_screenshot(os.path.join(debug_dir, f"after_processing_page_{current_page}.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, str(debug_path / f"after_processing_page_{current_page}.png"))
+        
+        # The scan's last page is only a hint; stop when the browser's pager agrees
+        if last_page is not None and current_page >= last_page and not has_later_page_link(driver, current_page):
+            logger.info(f"Page {current_page} is the last result page. Ending processing.")
+            break
         
         # Attempt to navigate to next page
         logger.info(f"Attempting to navigate from page {current_page} to next page")
@@ -286,9 +613,6 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
                 # If can't determine, assume next page
                 current_page += 1
                 logger.info(f"Could not determine new page number, assuming page {current_page}")
-            
-            # Add delay between pages
-            time.sleep(3)
         else:
             # Increment failures counter
             consecutive_failures += 1
@@ -301,8 +625,7 @@ def process_all_index_buttons(driver, output_dir, debug_dir, job_id=None, jobs=N
             
             # Try again with a page refresh
             try:
-                driver.refresh()
-                time.sleep(3)
+                reload_results_page(driver)
                 
                 # Try navigation again
                 if navigate_to_next_page(driver, current_page, debug_dir):
@@ -348,16 +671,19 @@ def navigate_to_next_page(driver, current_page, debug_dir):
     Returns:
         bool: True if navigation was successful, False otherwise
     """
+    debug_prefix = debug_dir + os.sep
+    
     try:
         # Take screenshot before navigation attempt
-        driver.save_screenshot(os.path.join(debug_dir, f"before_navigate_page_{current_page}.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, debug_prefix + f"before_navigate_page_{current_page}.png")
         
         # Log current page number and expected next page
         next_page = current_page + 1
         logger.info(f"Current page: {current_page}, looking for next page: {next_page}")
         
         # Find all pagination links - using the correct table structure based on the HTML snippet
-        pagination_links = driver.find_elements(By.XPATH, "//tr[td/a[contains(@href, \"javascript:__doPostBack('RegistrationGrid','Page$\")]]//td/a")
+        pagination_links = driver.find_elements(By.CSS_SELECTOR, _PAGER_LINK_CSS)
         
         # Log all found pagination links for debugging
         if pagination_links:
@@ -366,18 +692,17 @@ def navigate_to_next_page(driver, current_page, debug_dir):
             # Create a list of available page numbers for better decision making
             available_pages = []
             ellipsis_found = False
+            link_info = driver.execute_script(_LINK_TEXT_HREF_JS, pagination_links)
             
-            for i, link in enumerate(pagination_links):
+            for i, (text, href) in enumerate(link_info):
                 try:
-                    text = link.text.strip()
-                    href = link.get_attribute("href")
                     logger.info(f"Link {i+1}: text='{text}', href='{href}'")
                     
                     # Check if this is an ellipsis link
                     if text == "...":
                         ellipsis_found = True
                         # Extract target page number from href
-                        match = re.search(r"Page\$(\d+)", href)
+                        match = _PAGE_RE.search(href)
                         if match:
                             logger.info(f"Ellipsis points to page {match.group(1)}")
                     elif text.isdigit():
@@ -393,21 +718,25 @@ def navigate_to_next_page(driver, current_page, debug_dir):
         else:
             logger.warning("No pagination links found")
             # Take screenshot to debug why links weren't found
-            driver.save_screenshot(os.path.join(debug_dir, f"no_pagination_links_page_{current_page}.png"))
+            save_error_screenshot(driver, debug_prefix + f"no_pagination_links_page_{current_page}.jpg")
             
-            # Save page source for debugging
-            with open(os.path.join(debug_dir, f"page_source_no_links_{current_page}.html"), 'w', encoding='utf-8') as f:
-                f.write(driver.page_source)
+            # Save a snapshot of the page for debugging; Chrome serializes it in one pass
+            try:
+                snapshot = driver.execute_cdp_cmd('Page.captureSnapshot', {'format': 'mhtml'})
+                with open(debug_prefix + f"page_source_no_links_{current_page}.mhtml", 'w', encoding='utf-8') as f:
+                    f.write(snapshot['data'])
+            except Exception as e:
+                logger.warning(f"Could not save page snapshot: {str(e)}")
                 
             # Try refreshing the page once before giving up
             logger.info("Refreshing page to try again...")
-            driver.refresh()
-            time.sleep(3)
+            reload_results_page(driver)
             
             # Try again with a different XPath that's more permissive
-            pagination_links = driver.find_elements(By.XPATH, "//a[contains(@href, \"javascript:__doPostBack\")]")
+            pagination_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='javascript:__doPostBack']")
             if pagination_links:
                 logger.info(f"After refresh, found {len(pagination_links)} potential pagination links")
+                link_info = driver.execute_script(_LINK_TEXT_HREF_JS, pagination_links)
                 # Continue with the rest of the function
             else:
                 return False
@@ -416,13 +745,10 @@ def navigate_to_next_page(driver, current_page, debug_dir):
         logger.info(f"STRATEGY 1: Looking for direct link to page {next_page}")
         next_page_link = None
         
-        for link in pagination_links:
-            try:
-                if link.text.strip() == str(next_page):
-                    next_page_link = link
-                    break
-            except:
-                continue
+        for link, (text, href) in zip(pagination_links, link_info):
+            if text == str(next_page):
+                next_page_link = link
+                break
                 
         if next_page_link:
             logger.info(f"Found direct link to page {next_page}, clicking it")
@@ -430,11 +756,11 @@ def navigate_to_next_page(driver, current_page, debug_dir):
             try:
                 # Scroll to the link
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
                 
-                # Click the link
+                # Click the link and wait for the postback to replace the grid
+                grid = find_results_grid(driver)
                 next_page_link.click()
-                time.sleep(3)
+                wait_for_grid_replaced(driver, grid)
                 
                 # Verify navigation was successful
                 if verify_navigation_success(driver, debug_dir):
@@ -450,18 +776,14 @@ def navigate_to_next_page(driver, current_page, debug_dir):
         logger.info("STRATEGY 2: Looking for ellipsis link")
         ellipsis_link = None
         
-        for link in pagination_links:
-            try:
-                if link.text.strip() == "...":
-                    href = link.get_attribute("href")
-                    # Make sure this is a forward ellipsis (check the target page number)
-                    match = re.search(r"Page\$(\d+)", href)
-                    if match and int(match.group(1)) > current_page:
-                        logger.info(f"Found forward ellipsis to page {match.group(1)}")
-                        ellipsis_link = link
-                        break
-            except:
-                continue
+        for link, (text, href) in zip(pagination_links, link_info):
+            if text == "...":
+                # Make sure this is a forward ellipsis (check the target page number)
+                match = _PAGE_RE.search(href)
+                if match and int(match.group(1)) > current_page:
+                    logger.info(f"Found forward ellipsis to page {match.group(1)}")
+                    ellipsis_link = link
+                    break
         
         if ellipsis_link:
             logger.info("Clicking ellipsis link to navigate to next set of pages")
@@ -469,11 +791,11 @@ def navigate_to_next_page(driver, current_page, debug_dir):
             try:
                 # Scroll to the link
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
                 
-                # Click the link
+                # Click the link and wait for the postback to replace the grid
+                grid = find_results_grid(driver)
                 ellipsis_link.click()
-                time.sleep(3)
+                wait_for_grid_replaced(driver, grid)
                 
                 # Verify navigation was successful
                 if verify_navigation_success(driver, debug_dir):
@@ -487,30 +809,13 @@ def navigate_to_next_page(driver, current_page, debug_dir):
         
         # STRATEGY 3: If no direct next page or ellipsis, try any page number greater than current
         logger.info("STRATEGY 3: Looking for any page greater than current")
-        higher_page_links = []
-        
-        for link in pagination_links:
-            try:
-                text = link.text.strip()
-                if text.isdigit() and int(text) > current_page:
-                    higher_page_links.append((int(text), link))
-            except:
-                continue
+        next_available_page = driver.execute_script(_NEXT_HIGHER_PAGE_JS, current_page)
         
-        if higher_page_links:
-            # Sort by page number and take the lowest (next available)
-            higher_page_links.sort()
-            next_available_page, link = higher_page_links[0]
-            logger.info(f"Found higher page {next_available_page}, clicking it")
+        if next_available_page:
+            logger.info(f"Found higher page {next_available_page}, posting back to it")
             
             try:
-                # Scroll to the link
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
-                
-                # Click the link
-                link.click()
-                time.sleep(3)
+                postback_and_wait(driver, 'RegistrationGrid', f"Page${next_available_page}")
                 
                 # Verify navigation was successful
                 if verify_navigation_success(driver, debug_dir):
@@ -520,15 +825,13 @@ def navigate_to_next_page(driver, current_page, debug_dir):
                         logger.info(f"Successfully navigated to page {new_page} via higher page link")
                     return True
             except Exception as e:
-                logger.warning(f"Error clicking higher page link: {str(e)}")
+                logger.warning(f"Error navigating to higher page: {str(e)}")
         
         # If all navigation strategies failed, try direct JavaScript approach
         logger.info("STRATEGY 4: Using JavaScript postback directly")
         try:
-            script = f"__doPostBack('RegistrationGrid','Page${next_page}')"
-            logger.info(f"Executing JavaScript: {script}")
-            driver.execute_script(script)
-            time.sleep(3)
+            logger.info(f"Posting back to page {next_page}")
+            postback_and_wait(driver, 'RegistrationGrid', f"Page${next_page}")
             
             # Verify navigation was successful
             if verify_navigation_success(driver, debug_dir):
@@ -546,10 +849,7 @@ def navigate_to_next_page(driver, current_page, debug_dir):
     except Exception as e:
         logger.error(f"Error navigating to next page: {str(e)}")
         # Take screenshot for debugging
-        try:
-            driver.save_screenshot(os.path.join(debug_dir, f"error_navigate_page_{current_page}.png"))
-        except:
-            pass
+        save_error_screenshot(driver, debug_prefix + f"error_navigate_page_{current_page}.jpg")
         return False
 
 def verify_navigation_and_page(driver, expected_page, debug_dir):
@@ -566,27 +866,26 @@ def verify_navigation_and_page(driver, expected_page, debug_dir):
     """
     try:
         # Take screenshot after navigation
-        try:
-            driver.save_screenshot(os.path.join(debug_dir, f"after_navigate_to_page_{expected_page}.png"))
-        except:
-            pass
+        if DEBUG_SCREENSHOTS:
+            try:
+                save_debug_screenshot(driver, os.path.join(debug_dir, f"after_navigate_to_page_{expected_page}.png"))
+            except:
+                pass
         
         # Wait for page load
         try:
-            WebDriverWait(driver, 15).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            wait_for_document_ready(driver)
         except:
             logger.warning("Timeout waiting for page to load completely")
         
         # Check for IndexII buttons to verify we're on a results page
         try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//input[@value='IndexII']"))
+            wait_for(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, _INDEXII_CSS))
             )
             
             # Count buttons for logging
-            buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
+            buttons = driver.find_elements(By.CSS_SELECTOR, _INDEXII_CSS)
             logger.info(f"Found {len(buttons)} IndexII buttons after navigation")
             
             # Check current page number
@@ -611,24 +910,20 @@ def verify_navigation_and_page(driver, expected_page, debug_dir):
             
             # Try refreshing once
             try:
-                driver.refresh()
-                time.sleep(3)
-                
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//input[@value='IndexII']"))
-                )
-                logger.info("Found IndexII buttons after refresh")
-                return True
+                if reload_results_page(driver):
+                    logger.info("Found IndexII buttons after refresh")
+                    return True
             except:
-                logger.warning("No IndexII buttons found after refresh")
-                return False
+                pass
+            logger.warning("No IndexII buttons found after refresh")
+            return False
     except Exception as e:
         logger.error(f"Error verifying navigation: {str(e)}")
         return False
 
 def click_page_link_safely(driver, link, target_page, debug_dir):
     """
-    Safely click a page navigation link with multiple fallback strategies.
+    Safely follow a page navigation link, posting back directly for pager links.
     
     Args:
         driver: WebDriver instance
@@ -641,101 +936,39 @@ def click_page_link_safely(driver, link, target_page, debug_dir):
     """
     page_desc = str(target_page) if target_page else "ellipsis"
     
-    # Strategy 1: Extract href and use JavaScript directly
+    # Pager links only run __doPostBack, so post back directly instead of clicking
     try:
-        href = link.get_attribute("href")
-        if href and "javascript:__doPostBack" in href:
-            # Extract the page parameter
-            match = re.search(r"Page\$(\d+)", href)
-            if match:
-                page_num = match.group(1)
-                logger.info(f"Using direct JavaScript for page {page_num}")
-                
-                # Take screenshot before action
-                driver.save_screenshot(os.path.join(debug_dir, f"before_js_navigation_{page_desc}.png"))
-                
-                # Scroll to make navigation controls visible
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
-                
-                # Use direct JavaScript call
-                driver.execute_script(f"__doPostBack('RegistrationGrid','Page${page_num}')")
-                
-                # Wait for page to load
-                wait_result = wait_for_page_load(driver, 20)
-                
-                # Verify navigation
-                return verify_navigation_success(driver, debug_dir)
-    except Exception as e:
-        logger.warning(f"JavaScript navigation failed: {str(e)}")
-    
-    # Strategy 2: Use JavaScript click
-    try:
-        logger.info(f"Using JavaScript click for {page_desc}")
-        
-        # Take screenshot before action
-        driver.save_screenshot(os.path.join(debug_dir, f"before_js_click_{page_desc}.png"))
-        
-        # Scroll link into view
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link)
-        time.sleep(1)
-        
-        # JavaScript click
-        driver.execute_script("arguments[0].click();", link)
-        
-        # Wait for page to load
-        wait_result = wait_for_page_load(driver, 20)
-        
-        # Verify navigation
-        return verify_navigation_success(driver, debug_dir)
+        href = link.get_attribute("href") or ""
+        match = _PAGE_RE.search(href) if "javascript:__doPostBack" in href else None
+        if match:
+            page_num = match.group(1)
+            logger.info(f"Using direct JavaScript for page {page_num}")
+            
+            if DEBUG_SCREENSHOTS:
+                save_debug_screenshot(driver, os.path.join(debug_dir, f"before_js_navigation_{page_desc}.png"))
+            
+            postback_and_wait(driver, 'RegistrationGrid', f"Page${page_num}")
+            return verify_navigation_success(driver, debug_dir)
     except Exception as e:
-        logger.warning(f"JavaScript click failed: {str(e)}")
+        logger.warning(f"JavaScript navigation failed for {page_desc}: {str(e)}")
+        return False
     
-    # Strategy 3: Direct click
+    # Not a postback link: click it directly
     try:
         logger.info(f"Using direct click for {page_desc}")
         
-        # Take screenshot before action
-        driver.save_screenshot(os.path.join(debug_dir, f"before_direct_click_{page_desc}.png"))
-        
         # Scroll link into view
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link)
-        time.sleep(1)
+        driver.execute_script(_SCROLL_IF_NEEDED_JS, link)
         
-        # Direct click
+        grid = find_results_grid(driver)
         link.click()
-        
-        # Wait for page to load
-        wait_result = wait_for_page_load(driver, 20)
-        
-        # Verify navigation
-        return verify_navigation_success(driver, debug_dir)
-    except Exception as e:
-        logger.warning(f"Direct click failed: {str(e)}")
-    
-    # Strategy 4: ActionChains
-    try:
-        logger.info(f"Using ActionChains for {page_desc}")
-        
-        # Take screenshot before action
-        driver.save_screenshot(os.path.join(debug_dir, f"before_action_chains_{page_desc}.png"))
-        
-        # Scroll link into view
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link)
-        time.sleep(1)
-        
-        # ActionChains click
-        ActionChains(driver).move_to_element(link).click().perform()
-        
-        # Wait for page to load
-        wait_result = wait_for_page_load(driver, 20)
+        wait_for_grid_replaced(driver, grid)
         
         # Verify navigation
         return verify_navigation_success(driver, debug_dir)
     except Exception as e:
-        logger.warning(f"ActionChains click failed: {str(e)}")
+        logger.warning(f"Direct click failed for {page_desc}: {str(e)}")
     
-    logger.warning(f"All click strategies failed for {page_desc}")
     return False
 
 def verify_results_page(driver):
@@ -749,23 +982,8 @@ def verify_results_page(driver):
         bool: True if the current page is a results page, False otherwise
     """
     try:
-        # Check for IndexII buttons - the main indicator of a results page
-        buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
-        if buttons and len(buttons) > 0:
-            return True
-        
-        # Additional check for pagination section
-        pagination = driver.find_elements(By.XPATH, "//a[contains(@href, \"javascript:__doPostBack('RegistrationGrid','Page$\")]")
-        if pagination and len(pagination) > 0:
-            return True
-        
-        # Check for RegistrationGrid which contains the results
-        grid = driver.find_elements(By.ID, "RegistrationGrid")
-        if grid and len(grid) > 0:
-            return True
-        
-        # If none of the above were found, it's not a results page
-        return False
+        # IndexII buttons, pagination links or the RegistrationGrid mark a results page
+        return driver.execute_script(_RESULTS_PAGE_JS)
     except Exception as e:
         logger.error(f"Error verifying results page: {str(e)}")
         return False
@@ -782,19 +1000,8 @@ def wait_for_page_load(driver, timeout=20):
         bool: True if page loaded successfully, False otherwise
     """
     try:
-        # Wait for document to be ready
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        
-        # Wait for IndexII buttons to appear
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, "//input[@value='IndexII']"))
-        )
-        
-        # Add a small delay to ensure page is fully loaded
-        time.sleep(2)
-        
+        # Wait for the document to be ready and the IndexII buttons to appear, one script per poll
+        wait_for(driver, timeout).until(lambda d: d.execute_script(_PAGE_READY_JS))
         return True
     except Exception as e:
         logger.warning(f"Wait for page load failed: {str(e)}")
@@ -813,27 +1020,26 @@ def verify_navigation_success(driver, debug_dir):
     """
     try:
         # Take screenshot after navigation
-        try:
-            driver.save_screenshot(os.path.join(debug_dir, "after_navigation.png"))
-        except:
-            pass
+        if DEBUG_SCREENSHOTS:
+            try:
+                save_debug_screenshot(driver, os.path.join(debug_dir, "after_navigation.png"))
+            except:
+                pass
         
         # Wait for page to load
         try:
-            WebDriverWait(driver, 15).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            wait_for_document_ready(driver)
         except:
             logger.warning("Timeout waiting for page to load completely")
         
         # Check for IndexII buttons
         try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//input[@value='IndexII']"))
+            wait_for(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, _INDEXII_CSS))
             )
             
             # Count buttons for logging
-            buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
+            buttons = driver.find_elements(By.CSS_SELECTOR, _INDEXII_CSS)
             logger.info(f"Found {len(buttons)} IndexII buttons after navigation")
             
             # Get current page number for logging
@@ -847,13 +1053,8 @@ def verify_navigation_success(driver, debug_dir):
             
             # Try refreshing once
             try:
-                driver.refresh()
-                time.sleep(3)
-                
-                # Check again for IndexII buttons
-                buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
-                if buttons and len(buttons) > 0:
-                    logger.info(f"Found {len(buttons)} IndexII buttons after refresh")
+                if reload_results_page(driver):
+                    logger.info("Found IndexII buttons after refresh")
                     return True
                 else:
                     logger.warning("No IndexII buttons found after refresh")
@@ -865,8 +1066,129 @@ def verify_navigation_success(driver, debug_dir):
         logger.error(f"Error verifying navigation: {str(e)}")
         return False
 
+def capture_postback_document(worker, form_state, target, argument, pdf_path):
+    """
+    Replay an IndexII postback in a worker browser and save the document it shows.
+    
+    Args:
+        worker: WebDriver instance sharing the results page's session cookies
+        form_state: Results page form state from capture_form_state
+        target: __doPostBack event target
+        argument: __doPostBack event argument
+        pdf_path: Destination file path for the document
+    
+    Returns:
+        bool: True if the document was saved, False otherwise
+    """
+    original_handles = frozenset(worker.window_handles)
+    original_handle = worker.current_window_handle
+    
+    fields = [field for field in form_state['fields'] if field[0] not in ('__EVENTTARGET', '__EVENTARGUMENT')]
+    fields += [['__EVENTTARGET', target], ['__EVENTARGUMENT', argument]]
+    worker.execute_script(_REPLAY_POSTBACK_JS, form_state['url'], fields)
+    
+    def opened_tab(d):
+        # Return the handles read by the successful poll so they need not be read again
+        handles = d.window_handles
+        return handles if len(handles) > len(original_handles) else False
+    
+    try:
+        handles = wait_for(worker, 15).until(opened_tab)
+    except TimeoutException:
+        # No new tab; the document may have replaced the results page
+        if worker.find_elements(By.CSS_SELECTOR, _INDEXII_CSS):
+            return False
+        print_to_pdf_file(worker, pdf_path)
+        return True
+    
+    new_handle = next(h for h in handles if h not in original_handles)
+    switch_to_document_tab(worker, new_handle)
+    try:
+        wait_for_document_ready(worker)
+        print_to_pdf_file(worker, pdf_path)
+        return True
+    finally:
+        worker.close()
+        worker.switch_to.window(original_handle)
+
+def capture_documents_in_parallel(driver, driver_pool, tasks, workers):
+    """
+    Capture documents of the current results page using extra browsers.
+    
+    Each worker browser joins the results page's session by copying its cookies
+    and then replays IndexII postbacks with the page's form state, so the main
+    browser stays on the results page throughout.
+    
+    Args:
+        driver: WebDriver instance showing the results page
+        driver_pool: WebDriverPool supplying the worker browsers
+        tasks: List of (target, argument, pdf_path) tuples
+        workers: Number of worker browsers to use
+    
+    Returns:
+        dict: Mapping of task index to True/False for each task that was attempted
+    """
+    form_state = capture_form_state(driver)
+    cookies = driver.get_cookies()
+    pending = queue.Queue()
+    for index, task in enumerate(tasks):
+        pending.put((index, task))
+    results = {}
+    
+    def run_worker():
+        worker = driver_pool.get_driver()
+        if TEXT_ONLY_PDF:
+            block_urls(worker, DOCUMENT_BLOCKED_URL_PATTERNS)
+        try:
+            worker.get(form_state['url'])
+            for cookie in cookies:
+                worker.add_cookie({key: cookie[key] for key in ('name', 'value', 'path', 'secure', 'httpOnly')
+                                   if key in cookie})
+            while True:
+                try:
+                    index, (target, argument, pdf_path) = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = capture_postback_document(worker, form_state, target, argument, pdf_path)
+                except Exception as e:
+                    logger.warning(f"Worker failed to capture {pdf_path}: {str(e)}")
+                    results[index] = False
+        finally:
+            if TEXT_ONLY_PDF:
+                block_urls(worker)
+            driver_pool.return_driver(worker)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(run_worker) for _ in range(workers)]:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Document worker failed: {str(e)}")
+    
+    return results
+
+def fetch_documents_over_http(driver, tasks):
+    """
+    Download documents of the current results page without the browser.
+    
+    Args:
+        driver: WebDriver instance showing the results page
+        tasks: List of (target, argument, pdf_path) tuples
+    
+    Returns:
+        dict: Mapping of task index to True/False for each task that was attempted
+    """
+    try:
+        client = PostbackClient.from_driver(driver)
+    except Exception as e:
+        logger.warning(f"Could not share the browser session over HTTP: {str(e)}")
+        return {}
+    return {index: download_document(client, target, argument, pdf_path)
+            for index, (target, argument, pdf_path) in enumerate(tasks)}
+
 def process_page_documents(driver, page_number, output_dir, debug_dir, processed_document_hashes, 
-                           processed_button_identifiers, documents_processed_so_far):
+                           processed_button_identifiers, documents_processed_so_far, driver_pool=None):
     """
     Process all IndexII buttons on the current page.
     
@@ -878,6 +1200,11 @@ def process_page_documents(driver, page_number, output_dir, debug_dir, processed
         processed_document_hashes: Set of already processed document hashes (not used in this version)
         processed_button_identifiers: Set of already processed button identifiers (not used in this version)
         documents_processed_so_far: Count of documents processed before this page
+        driver_pool: Optional WebDriverPool; with DOCUMENT_WORKERS > 1 documents are
+            captured by worker browsers and only failures are retried here
+    
+    With HTTP_DOCUMENTS enabled, documents are first fetched over HTTP and only
+    the ones that fail go to the browsers.
     
     Returns:
         dict: Results of processing this page
@@ -890,15 +1217,16 @@ def process_page_documents(driver, page_number, output_dir, debug_dir, processed
     
     try:
         # Take screenshot of page before processing
-        try:
-            driver.save_screenshot(os.path.join(page_dir, f"page_{page_number}_before_processing.png"))
-        except:
-            logger.warning("Could not take initial page screenshot")
+        if DEBUG_SCREENSHOTS:
+            try:
+                save_debug_screenshot(driver, os.path.join(page_dir, f"page_{page_number}_before_processing.png"))
+            except:
+                logger.warning("Could not take initial page screenshot")
         
         # Wait for page to load properly
         try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//input[@value='IndexII']"))
+            wait_for(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, _INDEXII_CSS))
             )
             logger.info(f"IndexII buttons found on page {page_number}")
         except TimeoutException:
@@ -909,36 +1237,81 @@ def process_page_documents(driver, page_number, output_dir, debug_dir, processed
                 pass
             return {"processed": 0, "downloaded": 0}
         
-        # Get all buttons on this page
-        buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
-        logger.info(f"Found {len(buttons)} IndexII buttons on page {page_number}")
+        # Snapshot every button's onclick in one round trip
+        onclicks = driver.execute_script(_INDEXII_ONCLICKS_JS)
+        button_count = len(onclicks)
+        logger.info(f"Found {button_count} IndexII buttons on page {page_number}")
+        
+        # Capture the page's documents over HTTP and with worker browsers first;
+        # anything they miss falls through to the one-at-a-time loop below
+        captured = set()
+        document_numbers = {}
+        use_workers = driver_pool is not None and DOCUMENT_WORKERS > 1
+        if HTTP_DOCUMENTS or use_workers:
+            path_prefix = document_path_prefix(output_dir, page_number)
+            tasks = []
+            task_buttons = []
+            for i in range(button_count):
+                document_number = documents_processed_so_far + len(document_numbers) + 1
+                document_numbers[i] = document_number
+                postback = parse_postback(onclicks[i])
+                if not postback:
+                    continue
+                tasks.append(postback + (f"{path_prefix}{document_number}.pdf",))
+                task_buttons.append(i)
+            
+            outcomes = {}
+            if tasks and HTTP_DOCUMENTS:
+                outcomes = fetch_documents_over_http(driver, tasks)
+                logger.info(f"Fetched {sum(outcomes.values())}/{len(tasks)} documents on page {page_number} over HTTP")
+            
+            remaining = [task_index for task_index in range(len(tasks)) if not outcomes.get(task_index)]
+            if remaining and use_workers:
+                logger.info(f"Capturing {len(remaining)} documents on page {page_number} with {DOCUMENT_WORKERS} browsers")
+                worker_outcomes = capture_documents_in_parallel(driver, driver_pool, [tasks[t] for t in remaining],
+                                                                min(DOCUMENT_WORKERS, len(remaining)))
+                for k, task_index in enumerate(remaining):
+                    outcomes[task_index] = worker_outcomes.get(k, False)
+                logger.info(f"Worker browsers captured {sum(worker_outcomes.values())}/{len(remaining)} documents on page {page_number}")
+            
+            for task_index, i in enumerate(task_buttons):
+                if outcomes.get(task_index):
+                    captured.add(i)
+                    page_processed += 1
+                    page_downloaded += 1
         
         # Process each button
-        for i in range(len(buttons)):
-            # Get a fresh reference to all buttons to avoid stale elements
-            fresh_buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
+        for i in range(button_count):
+            if i in captured:
+                continue
             
-            if i >= len(fresh_buttons):
-                logger.warning(f"Button index {i} out of range (found {len(fresh_buttons)} buttons)")
-                break
-                
-            # Calculate document number for file naming
-            document_number = documents_processed_so_far + page_processed + 1
+            # Postbacks run straight from the snapshot; only buttons without one are looked up again
+            button = None
+            if not parse_postback(onclicks[i]):
+                fresh_buttons = driver.find_elements(By.CSS_SELECTOR, _INDEXII_CSS)
+                if i >= len(fresh_buttons):
+                    logger.warning(f"Button index {i} out of range (found {len(fresh_buttons)} buttons)")
+                    break
+                button = fresh_buttons[i]
+            
+            # Calculate document number for file naming (workers may have reserved one already)
+            document_number = document_numbers.get(i, documents_processed_so_far + page_processed + 1)
             
             # Process this button
-            logger.info(f"Processing document {document_number} on page {page_number} (button {i+1}/{len(buttons)})")
+            logger.info(f"Processing document {document_number} on page {page_number} (button {i+1}/{button_count})")
             
             try:
                 # Use a simplified approach to click the button and handle the document
-                result = process_button_simply(driver, fresh_buttons[i], document_number, page_number, output_dir, page_dir)
+                result = process_button_simply(driver, button, document_number, page_number, output_dir, page_dir,
+                                               onclick=onclicks[i], button_index=i)
                 
                 if result:
                     page_downloaded += 1
                 
                 page_processed += 1
                 
-                # Add short delay between documents
-                time.sleep(2)
+                # Continue as soon as the results grid is back rather than after a fixed delay
+                wait_for_results_buttons(driver)
             except Exception as e:
                 logger.error(f"Error processing button {i} on page {page_number}: {str(e)}")
                 # Continue with next button
@@ -948,8 +1321,7 @@ def process_page_documents(driver, page_number, output_dir, debug_dir, processed
                     # Check if we're still on results page
                     if not verify_results_page(driver):
                         logger.warning("Not on results page after error, refreshing")
-                        driver.refresh()
-                        time.sleep(3)
+                        reload_results_page(driver)
                 except:
                     logger.warning("Error checking results page after button error")
     
@@ -979,18 +1351,18 @@ def process_single_document_with_button(driver, button, document_number, doc_id,
         debug_dir: Directory for debug files
     
     Returns:
-        bool: True if document was successfully processed, False otherwise
+        bool: True if document was successfully processed, False otherwise, or
+        None if the button went stale and should be looked up again
     """
-    # Store original window handles
-    original_handles = driver.window_handles
+    # Store original window handles as a set for membership checks
+    original_handles = frozenset(driver.window_handles)
     original_handle = driver.current_window_handle
     original_url = driver.current_url
     
     try:
         # Scroll to button to ensure it's visible
         try:
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-            time.sleep(1)
+            driver.execute_script(_SCROLL_IF_NEEDED_JS, button)
         except:
             logger.warning(f"Failed to scroll to button for document ID {doc_id}")
             # Continue anyway
@@ -1000,27 +1372,35 @@ def process_single_document_with_button(driver, button, document_number, doc_id,
         
         # Method 1: Direct click
         try:
-            logger.info(f"Clicking IndexII button for document ID {doc_id} (doc #{document_number})")
+            logger.debug("Clicking IndexII button for document ID %s (doc #%s)", doc_id, document_number)
             button.click()
-            time.sleep(3)
+            new_handles, current_url, left_results = wait_for_postback_result(
+                driver, original_handles, original_url, _CLICK_EFFECT_TIMEOUT)
             
             # Check if click worked
-            new_handles = driver.window_handles
-            if len(new_handles) > len(original_handles) or driver.current_url != original_url:
+            if len(new_handles) > len(original_handles) or left_results:
                 click_successful = True
+            elif not RETRY_INEFFECTIVE_CLICKS:
+                # The click went through; a JavaScript click would trigger the same handler
+                logger.warning(f"Button click had no visible effect for document ID {doc_id}")
+                return False
+        except StaleElementReferenceException:
+            # A JavaScript click on a detached button fails too; let the caller find it again
+            logger.warning(f"Button for document ID {doc_id} went stale before the click")
+            return None
         except Exception as e:
             logger.warning(f"Direct click failed for document ID {doc_id}: {str(e)}")
         
         # Method 2: JavaScript click as fallback
         if not click_successful:
             try:
-                logger.info(f"Using JavaScript click for document ID {doc_id}")
+                logger.debug("Using JavaScript click for document ID %s", doc_id)
                 driver.execute_script("arguments[0].click();", button)
-                time.sleep(3)
+                new_handles, current_url, left_results = wait_for_postback_result(
+                    driver, original_handles, original_url, _CLICK_EFFECT_TIMEOUT)
                 
                 # Check if click worked
-                new_handles = driver.window_handles
-                if len(new_handles) > len(original_handles) or driver.current_url != original_url:
+                if len(new_handles) > len(original_handles) or left_results:
                     click_successful = True
             except Exception as e:
                 logger.warning(f"JavaScript click failed for document ID {doc_id}: {str(e)}")
@@ -1030,51 +1410,28 @@ def process_single_document_with_button(driver, button, document_number, doc_id,
             logger.warning(f"All click methods failed for document ID {doc_id}")
             return False
         
-        # Handle new tab or page change
-        new_handles = driver.window_handles
+        # Handle new tab or page change, as seen when the click's wait ended
         
         # Case 1: New tab opened
         if len(new_handles) > len(original_handles):
-            logger.info(f"New tab opened for document ID {doc_id}")
+            logger.debug("New tab opened for document ID %s", doc_id)
             
             # Switch to new tab
-            new_handle = [h for h in new_handles if h not in original_handles][0]
-            driver.switch_to.window(new_handle)
+            new_handle = next(h for h in new_handles if h not in original_handles)
+            switch_to_document_tab(driver, new_handle)
             
             # Wait for document to load
             try:
-                WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                time.sleep(2)  # Additional wait for content to load
+                wait_for_document_ready(driver)
                 
-                # Generate PDF
+                # Save the document as a PDF, or as a screenshot if printing fails
                 pdf_path = os.path.join(output_dir, f"Document-{document_number}-ID{doc_id}.pdf")
-                
-                try:
-                    # Use PDF printing
-                    pdf_options = {
-                        'printBackground': True,
-                        'paperWidth': 8.27,  # A4 width
-                        'paperHeight': 11.69,  # A4 height
-                        'marginTop': 0.4,
-                        'marginBottom': 0.4,
-                        'scale': 1.0
-                    }
-                    
-                    pdf_data = driver.execute_cdp_cmd('Page.printToPDF', pdf_options)
-                    
-                    with open(pdf_path, 'wb') as pdf_file:
-                        pdf_file.write(base64.b64decode(pdf_data['data']))
-                    
+                image_path = os.path.join(output_dir, f"Document-{document_number}-ID{doc_id}.jpg")
+                if save_current_page_as_pdf(driver, pdf_path, image_path):
                     logger.info(f"Document ID {doc_id} saved to {pdf_path}")
-                    success = True
-                except Exception as pdf_error:
-                    logger.warning(f"PDF generation failed for document ID {doc_id}: {str(pdf_error)}")
-                    
-                    # Fallback to screenshot if PDF fails
-                    screenshot_path = os.path.join(output_dir, f"Document-{document_number}-ID{doc_id}.png")
-                    driver.save_screenshot(screenshot_path)
+                else:
                     logger.info(f"Saved screenshot instead for document ID {doc_id}")
-                    success = True
+                success = True
                 
                 # Close tab and return to original
                 driver.close()
@@ -1089,65 +1446,30 @@ def process_single_document_with_button(driver, button, document_number, doc_id,
                     driver.switch_to.window(original_handle)
                 except:
                     # If we can't close/switch properly, try to get back to a working state
-                    for handle in driver.window_handles:
-                        if handle == original_handle:
-                            driver.switch_to.window(handle)
-                            break
+                    driver.switch_to.window(original_handle)
                 return False
         
-        # Case 2: URL changed but no new tab
-        elif driver.current_url != original_url:
-            logger.info(f"Page content changed for document ID {doc_id} (no new tab)")
+        # Case 2: Document replaced the results page, with or without a new URL
+        elif left_results:
+            logger.debug("Page content changed for document ID %s (no new tab)", doc_id)
             
-            # Generate PDF
+            # Save the document as a PDF, or as a screenshot if printing fails
             pdf_path = os.path.join(output_dir, f"Document-{document_number}-ID{doc_id}.pdf")
-            
-            try:
-                # Use PDF printing
-                pdf_options = {
-                    'printBackground': True,
-                    'paperWidth': 8.27,
-                    'paperHeight': 11.69,
-                    'marginTop': 0.4,
-                    'marginBottom': 0.4,
-                    'scale': 1.0
-                }
-                
-                pdf_data = driver.execute_cdp_cmd('Page.printToPDF', pdf_options)
-                
-                with open(pdf_path, 'wb') as pdf_file:
-                    pdf_file.write(base64.b64decode(pdf_data['data']))
-                
+            image_path = os.path.join(output_dir, f"Document-{document_number}-ID{doc_id}.jpg")
+            if save_current_page_as_pdf(driver, pdf_path, image_path):
                 logger.info(f"Document ID {doc_id} saved to {pdf_path}")
-                success = True
-            except Exception as pdf_error:
-                logger.warning(f"PDF generation failed for document ID {doc_id}: {str(pdf_error)}")
-                
-                # Fallback to screenshot
-                screenshot_path = os.path.join(output_dir, f"Document-{document_number}-ID{doc_id}.png")
-                driver.save_screenshot(screenshot_path)
+            else:
                 logger.info(f"Saved screenshot instead for document ID {doc_id}")
-                success = True
+            success = True
             
             # Navigate back to results
             try:
-                driver.back()
-                time.sleep(2)
-                
-                # Make sure we're back on results page
-                try:
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, "//input[@value='IndexII']"))
-                    )
-                except:
-                    logger.warning("Back navigation didn't return to results, refreshing")
-                    driver.refresh()
-                    time.sleep(3)
+                return_to_results(driver)
             except:
                 # If back navigation fails, try to reload the original URL
                 try:
                     driver.get(original_url)
-                    time.sleep(3)
+                    wait_for_results_buttons(driver)
                 except:
                     pass
             
@@ -1164,23 +1486,17 @@ def process_single_document_with_button(driver, button, document_number, doc_id,
         # Try to recover to original state
         try:
             # If new tabs were opened, close them
-            if len(driver.window_handles) > len(original_handles):
-                for handle in driver.window_handles:
-                    if handle != original_handle:
-                        driver.switch_to.window(handle)
-                        driver.close()
-                
-                driver.switch_to.window(original_handle)
+            close_new_tabs(driver, original_handles, original_handle)
             
             # If we navigated away, go back to original URL
             if driver.current_url != original_url:
                 driver.get(original_url)
-                time.sleep(3)
+                wait_for_results_buttons(driver)
         except:
             # Last resort - just try to get back to original URL
             try:
                 driver.get(original_url)
-                time.sleep(3)
+                wait_for_results_buttons(driver)
             except:
                 pass
         
@@ -1190,6 +1506,29 @@ def get_current_page_number(driver):
     """
     Get the current page number from the pagination controls.
     
+    The result is remembered per results grid element: a postback replaces the
+    grid, so a changed element ID means the page may have changed.
+    
+    Args:
+        driver: WebDriver instance
+    
+    Returns:
+        int: Current page number or None if not detected
+    """
+    grid = find_results_grid(driver)
+    cached = _page_number_cache.get(driver)
+    if grid is not None and cached is not None and cached[0] == grid.id:
+        return cached[1]
+    
+    page = read_current_page_number(driver)
+    if grid is not None and page is not None:
+        _page_number_cache[driver] = (grid.id, page)
+    return page
+
+def read_current_page_number(driver):
+    """
+    Read the current page number from the pagination controls without caching.
+    
     Args:
         driver: WebDriver instance
     
@@ -1197,49 +1536,17 @@ def get_current_page_number(driver):
         int: Current page number or None if not detected
     """
     try:
-        # Method 1: Look for span tag inside the pagination controls (most reliable)
-        # This is the element that looks like: <span>1</span>
-        spans = driver.find_elements(By.XPATH, "//tr[@class='GridPager']/td/span")
-        for span in spans:
-            try:
-                text = span.text.strip()
-                if text.isdigit():
-                    logger.info(f"Current page detected as {text} from span tag")
-                    driver.save_screenshot(f"debug/page_{text}_detected.png")
-                    return int(text)
-            except:
-                pass
-                
-        # Method 2: Look for pagination controls and infer page number
-        # Check for selected page by looking at links without href
-        selected = driver.find_elements(By.XPATH, "//tr[@class='GridPager']/td/span[not(parent::a)]")
-        for span in selected:
-            try:
-                text = span.text.strip()
-                if text.isdigit():
-                    logger.info(f"Current page detected as {text} from selected page span")
-                    return int(text)
-            except:
-                pass
+        # The current page is the pager's unlinked <span>1</span>, or failing that
+        # the link styled as selected; both are checked in one round trip
+        detected = driver.execute_script(_CURRENT_PAGE_JS)
+        if detected:
+            source, text = detected
+            logger.info(f"Current page detected as {text} from {source}")
+            return int(text)
         
-        # Method 3: Check for styled links which indicate current page
-        links = driver.find_elements(By.XPATH, "//tr[@class='GridPager']/td/a")
-        for link in links:
-            try:
-                style = link.get_attribute("style")
-                if style and "color:White" in style:  # Selected page is styled differently
-                    text = link.text.strip()
-                    if text.isdigit():
-                        logger.info(f"Current page detected as {text} from styled link")
-                        return int(text)
-            except:
-                pass
-                
         # Take a screenshot to help debug page number issue
-        try:
-            driver.save_screenshot("debug/page_number_detection_issue.png")
-        except:
-            pass
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, "debug/page_number_detection_issue.png")
         
         logger.warning("Could not determine current page number")
         return None
@@ -1263,29 +1570,27 @@ def process_all_documents(driver, output_dir, debug_dir):
         logger.info(f"Processing page {current_page}")
         
         # Take screenshot of current page
-        driver.save_screenshot(os.path.join(debug_dir, f"page_{current_page}.png"))
+        if DEBUG_SCREENSHOTS:
+            save_debug_screenshot(driver, os.path.join(debug_dir, f"page_{current_page}.png"))
         
         # Verify we're on a results page
         if not verify_results_page(driver):
             logger.warning(f"Not on results page at page {current_page}, stopping processing")
             break
         
-        # Get all IndexII buttons on current page
-        index_buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
-        logger.info(f"Found {len(index_buttons)} IndexII buttons on page {current_page}")
+        # Read every IndexII button's onclick in one round trip instead of one per button
+        onclicks = driver.execute_script(_INDEXII_ONCLICKS_JS)
+        logger.info(f"Found {len(onclicks)} IndexII buttons on page {current_page}")
         
         # Process each button
-        for i, button in enumerate(index_buttons):
+        for i, onclick in enumerate(onclicks):
             try:
-                # Extract button ID for tracking
-                button_id = None
-                try:
-                    onclick = button.get_attribute("onclick")
-                    match = re.search(r"indexII\$(\d+)", onclick)
-                    if match:
-                        button_id = f"page_{current_page}_indexII_{match.group(1)}"
-                except:
-                    button_id = f"page_{current_page}_position_{i}"
+                # Track buttons by (page, indexII number); buttons without one use a negative position
+                match = _INDEXII_RE.search(onclick)
+                if match:
+                    button_id = (current_page, int(match.group(1)))
+                else:
+                    button_id = (current_page, -(i + 1))
                 
                 # Skip if already processed
                 if button_id in processed_button_ids:
@@ -1312,25 +1617,20 @@ def process_all_documents(driver, output_dir, debug_dir):
                 # Verify we're still on results page after processing
                 if not verify_results_page(driver):
                     logger.warning("Not on results page after processing document, refreshing")
-                    driver.refresh()
-                    time.sleep(3)
+                    reload_results_page(driver)
                     
                     # Verify again after refresh
                     if not verify_results_page(driver):
                         logger.error("Still not on results page after refresh, stopping processing")
                         break
                     
-                    # Re-find buttons after refresh
-                    index_buttons = driver.find_elements(By.XPATH, "//input[@value='IndexII']")
-                    if i < len(index_buttons):
-                        # Update button reference
-                        button = index_buttons[i]
-                    else:
+                    # Buttons are addressed by position, so make sure this one survived the refresh
+                    if i >= len(driver.execute_script(_INDEXII_ONCLICKS_JS)):
                         logger.warning(f"Button index {i} out of range after refresh")
                         break
                 
-                # Add a small delay between documents
-                time.sleep(2)
+                # Continue as soon as the results grid is back rather than after a fixed delay
+                wait_for_results_buttons(driver)
                 
             except Exception as e:
                 logger.error(f"Error processing button {i} on page {current_page}: {str(e)}")
@@ -1339,8 +1639,7 @@ def process_all_documents(driver, output_dir, debug_dir):
                 # Try to recover
                 try:
                     if not verify_results_page(driver):
-                        driver.refresh()
-                        time.sleep(3)
+                        reload_results_page(driver)
                 except:
                     logger.error("Failed to recover after error")
                     break
@@ -1358,9 +1657,6 @@ def process_all_documents(driver, output_dir, debug_dir):
                 current_page += 1
                 
             logger.info(f"Advanced to page {current_page}")
-            
-            # Add delay between pages
-            time.sleep(3)
         else:
             logger.info("No more pages to process")
             break
@@ -1372,86 +1668,104 @@ def process_all_documents(driver, output_dir, debug_dir):
         "documents_downloaded": downloaded_documents
     }
 
-def process_button_simply(driver, button, document_number, page_number, output_dir, debug_dir):
+def process_button_simply(driver, button, document_number, page_number, output_dir, debug_dir, onclick=None,
+                          button_index=None):
     """
     Simply process a single IndexII button without tracking document IDs.
     
     Args:
         driver: WebDriver instance
-        button: The IndexII button element to click
+        button: The IndexII button element to click, or None to run its postback first
         document_number: Document number for naming
         page_number: Current page number
         output_dir: Directory to save document
         debug_dir: Directory for debug files
+        onclick: The button's onclick attribute, if already known
+        button_index: Position of the button among the page's IndexII buttons; used
+            to look it up for the click fallbacks when button is None
     
     Returns:
         bool: True if document was successfully processed, False otherwise
     """
-    # Store original window handles
-    original_handles = driver.window_handles
+    # Store original window handles as a set for membership checks
+    original_handles = frozenset(driver.window_handles)
     original_handle = driver.current_window_handle
     original_url = driver.current_url
+    # What the last click was seen to do; recovery uses it to skip checks that cannot matter
+    new_handles, current_url, left_results = original_handles, original_url, False
     
     try:
         # Extract onclick attribute for direct JavaScript execution (most reliable)
-        onclick = button.get_attribute("onclick")
+        if onclick is None:
+            onclick = button.get_attribute("onclick")
         click_successful = False
         
         # Method 1: Try using __doPostBack if available
         if onclick and "__doPostBack" in onclick:
-            match = re.search(r"__doPostBack\('([^']+)',\s*'([^']+)'\)", onclick)
-            if match:
-                target, argument = match.groups()
-                logger.info(f"Executing __doPostBack for document {document_number}")
+            postback = parse_postback(onclick)
+            if postback:
+                target, argument = postback
+                logger.debug("Executing __doPostBack for document %s", document_number)
                 
                 # Execute JavaScript directly
-                driver.execute_script(f"__doPostBack('{target}', '{argument}')")
-                time.sleep(2.5)  # Wait a bit longer
+                driver.execute_script("__doPostBack(arguments[0], arguments[1]);", target, argument)
+                new_handles, current_url, left_results = wait_for_postback_result(
+                    driver, original_handles, original_url, _CLICK_EFFECT_TIMEOUT)
                 
                 # Check for new tab
-                new_handles = driver.window_handles
                 if len(new_handles) > len(original_handles):
                     click_successful = True
-                    logger.info(f"JavaScript execution opened new tab for document {document_number}")
-                elif driver.current_url != original_url:
+                    logger.debug("JavaScript execution opened new tab for document %s", document_number)
+                elif left_results:
                     click_successful = True
-                    logger.info(f"JavaScript execution changed URL for document {document_number}")
+                    logger.debug("JavaScript execution left the results page for document %s", document_number)
+                elif not RETRY_INEFFECTIVE_CLICKS:
+                    # Clicking the button would run the same postback again
+                    logger.warning(f"__doPostBack had no visible effect for document {document_number}")
+                    return False
+        
+        # Rows run from the onclick snapshot have no element yet; find it only when a click is needed
+        if not click_successful and button is None and button_index is not None:
+            fresh_buttons = driver.find_elements(By.CSS_SELECTOR, _INDEXII_CSS)
+            if button_index < len(fresh_buttons):
+                button = fresh_buttons[button_index]
+            else:
+                logger.warning(f"Button index {button_index} out of range (found {len(fresh_buttons)} buttons)")
         
         # Method 2: Try direct click if JavaScript didn't work
-        if not click_successful:
+        if not click_successful and button is not None:
             try:
                 # Scroll to make button visible
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                time.sleep(1)
+                driver.execute_script(_SCROLL_IF_NEEDED_JS, button)
                 
                 # Click the button
                 button.click()
-                logger.info(f"Clicked IndexII button for document {document_number}")
-                time.sleep(2.5)  # Wait a bit longer
+                logger.debug("Clicked IndexII button for document %s", document_number)
+                new_handles, current_url, left_results = wait_for_postback_result(
+                    driver, original_handles, original_url, _CLICK_EFFECT_TIMEOUT)
                 
                 # Check for new tab
-                new_handles = driver.window_handles
                 if len(new_handles) > len(original_handles):
                     click_successful = True
-                    logger.info(f"Direct click opened new tab for document {document_number}")
-                elif driver.current_url != original_url:
+                    logger.debug("Direct click opened new tab for document %s", document_number)
+                elif left_results:
                     click_successful = True
-                    logger.info(f"Direct click changed URL for document {document_number}")
+                    logger.debug("Direct click left the results page for document %s", document_number)
             except Exception as click_error:
                 # If direct click fails, try JavaScript click
                 try:
-                    logger.info(f"Direct click failed, trying JavaScript click for document {document_number}")
+                    logger.debug("Direct click failed, trying JavaScript click for document %s", document_number)
                     driver.execute_script("arguments[0].click();", button)
-                    time.sleep(2.5)  # Wait a bit longer
+                    new_handles, current_url, left_results = wait_for_postback_result(
+                        driver, original_handles, original_url, _CLICK_EFFECT_TIMEOUT)
                     
                     # Check for new tab
-                    new_handles = driver.window_handles
                     if len(new_handles) > len(original_handles):
                         click_successful = True
-                        logger.info(f"JavaScript click opened new tab for document {document_number}")
-                    elif driver.current_url != original_url:
+                        logger.debug("JavaScript click opened new tab for document %s", document_number)
+                    elif left_results:
                         click_successful = True
-                        logger.info(f"JavaScript click changed URL for document {document_number}")
+                        logger.debug("JavaScript click left the results page for document %s", document_number)
                 except Exception as js_error:
                     logger.error(f"JavaScript click also failed for document {document_number}")
         
@@ -1460,130 +1774,58 @@ def process_button_simply(driver, button, document_number, page_number, output_d
             logger.warning(f"All click methods failed for document {document_number}")
             return False
         
-        # Handle new tab or page change
-        new_handles = driver.window_handles
+        # Handle new tab or page change, as seen when the click's wait ended
         
         # Case 1: New tab opened
         if len(new_handles) > len(original_handles):
-            logger.info(f"New tab opened for document {document_number}")
+            logger.debug("New tab opened for document %s", document_number)
             
-            # Find the new tab handle
-            new_handle = None
-            for handle in new_handles:
-                if handle not in original_handles:
-                    new_handle = handle
-                    break
+            # Find the new tab handle among those read when the wait ended
+            new_handle = next((h for h in new_handles if h not in original_handles), None)
             
             if not new_handle:
                 logger.error(f"Could not identify new tab for document {document_number}")
                 return False
             
             # Switch to new tab (deliberately using new_handle instead of relying on list comprehension)
-            logger.info(f"Switching to new tab for document {document_number}")
-            driver.switch_to.window(new_handle)
+            logger.debug("Switching to new tab for document %s", document_number)
+            switch_to_document_tab(driver, new_handle)
             
             # Wait for document to load
             try:
-                WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                time.sleep(2)  # Additional wait for content to load
-                
-                # Generate PDF
-                pdf_path = os.path.join(output_dir, f"Document-P{page_number}-{document_number}.pdf")
-                
-                try:
-                    # Use PDF printing
-                    pdf_options = {
-                        'printBackground': True,
-                        'paperWidth': 8.27,  # A4 width
-                        'paperHeight': 11.69,  # A4 height
-                        'marginTop': 0.4,
-                        'marginBottom': 0.4,
-                        'scale': 1.0
-                    }
-                    
-                    pdf_data = driver.execute_cdp_cmd('Page.printToPDF', pdf_options)
-                    
-                    with open(pdf_path, 'wb') as pdf_file:
-                        pdf_file.write(base64.b64decode(pdf_data['data']))
-                    
-                    logger.info(f"Document {document_number} saved to {pdf_path}")
-                    success = True
-                except Exception as pdf_error:
-                    logger.warning(f"PDF generation failed: {str(pdf_error)}")
-                    
-                    # Fallback to screenshot
-                    screenshot_path = os.path.join(output_dir, f"Document-P{page_number}-{document_number}.png")
-                    driver.save_screenshot(screenshot_path)
-                    logger.info(f"Saved screenshot instead at {screenshot_path}")
-                    success = True
+                wait_for_document_ready(driver)
+                success = save_document_pdf(driver, output_dir, page_number, document_number)
             except Exception as e:
                 logger.error(f"Error processing document in new tab: {str(e)}")
                 success = False
             
             # Always close the new tab and switch back regardless of success/failure
-            logger.info(f"Closing tab for document {document_number}")
+            logger.debug("Closing tab for document %s", document_number)
             driver.close()
             driver.switch_to.window(original_handle)
             
-            # Verify we're back on the original tab
-            if driver.current_url != original_url:
-                logger.warning(f"URL changed after switching back from document {document_number}, refreshing")
-                driver.get(original_url)
-                time.sleep(2)
+            # Closing the document tab leaves the results tab as it was; only reload it if the results are gone
+            if not verify_results_page(driver):
+                logger.warning(f"Results page lost after switching back from document {document_number}, refreshing")
+                reload_results_page(driver)
             
             return success
         
-        # Case 2: URL changed but no new tab
-        elif driver.current_url != original_url:
-            logger.info(f"Page content changed for document {document_number} (no new tab)")
-            
-            # Generate PDF
-            pdf_path = os.path.join(output_dir, f"Document-P{page_number}-{document_number}.pdf")
-            
-            try:
-                # Use PDF printing
-                pdf_options = {
-                    'printBackground': True,
-                    'paperWidth': 8.27,
-                    'paperHeight': 11.69,
-                    'marginTop': 0.4,
-                    'marginBottom': 0.4,
-                    'scale': 1.0
-                }
-                
-                pdf_data = driver.execute_cdp_cmd('Page.printToPDF', pdf_options)
-                
-                with open(pdf_path, 'wb') as pdf_file:
-                    pdf_file.write(base64.b64decode(pdf_data['data']))
-                
-                logger.info(f"Document {document_number} saved to {pdf_path}")
-                success = True
-            except Exception as pdf_error:
-                logger.warning(f"PDF generation failed: {str(pdf_error)}")
-                
-                # Fallback to screenshot
-                screenshot_path = os.path.join(output_dir, f"Document-P{page_number}-{document_number}.png")
-                driver.save_screenshot(screenshot_path)
-                logger.info(f"Saved screenshot instead at {screenshot_path}")
-                success = True
+        # Case 2: Document replaced the results page, with or without a new URL
+        elif left_results:
+            logger.debug("Page content changed for document %s (no new tab)", document_number)
+            success = save_document_pdf(driver, output_dir, page_number, document_number)
             
             # Navigate back to results
             try:
-                logger.info(f"Navigating back from document {document_number}")
-                driver.back()
-                time.sleep(2)
-                
-                # Make sure we're back on results page
-                if not verify_results_page(driver):
-                    logger.warning("Back navigation didn't return to results, refreshing")
-                    driver.refresh()
-                    time.sleep(2)
+                logger.debug("Navigating back from document %s", document_number)
+                return_to_results(driver)
             except:
                 # If back navigation fails, try to reload the original URL
                 try:
                     logger.warning(f"Back navigation failed for document {document_number}, loading original URL")
                     driver.get(original_url)
-                    time.sleep(2)
+                    wait_for_results_buttons(driver)
                 except:
                     pass
             
@@ -1599,32 +1841,23 @@ def process_button_simply(driver, button, document_number, page_number, output_d
         
         # Always try to recover to original state
         try:
-            # Check if we have new tabs to close
-            current_handles = driver.window_handles
-            if len(current_handles) > len(original_handles):
-                # Close any new tabs that were opened
-                for handle in current_handles:
-                    if handle != original_handle and handle in driver.window_handles:
-                        try:
-                            driver.switch_to.window(handle)
-                            driver.close()
-                        except:
-                            logger.warning(f"Failed to close extra tab during error recovery")
-                
-                # Make sure we're on the original tab
-                if original_handle in driver.window_handles:
-                    driver.switch_to.window(original_handle)
+            opened_tab = len(new_handles) > len(original_handles)
             
-            # If we navigated away, go back to original URL
-            if driver.current_url != original_url:
-                driver.get(original_url)
-                time.sleep(2)
+            # Close any new tabs, unless the click was seen to navigate in place instead
+            if opened_tab or not left_results:
+                close_new_tabs(driver, original_handles, original_handle)
+            
+            # If we navigated away, step back to the results, loading the original URL as a last resort
+            if left_results or driver.current_url != original_url:
+                if not return_to_results(driver):
+                    driver.get(original_url)
+                    wait_for_results_buttons(driver)
         except Exception as recovery_error:
             logger.error(f"Error during recovery: {str(recovery_error)}")
             # Last resort - try to get back to original URL
             try:
                 driver.get(original_url)
-                time.sleep(2)
+                wait_for_results_buttons(driver)
             except:
                 pass
         
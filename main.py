@@ -1,6 +1,11 @@
 # main.py
 import os
 import threading
+from config import setup_logging
+
+# Configure logging before importing app, which starts the driver pool on import
+setup_logging()
+
 from app import app, start_cleanup_scheduler
 
 if __name__ == '__main__':
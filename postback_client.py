@@ -0,0 +1,245 @@
+import re
+import logging
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+import pdfkit
+import requests
+from config import TIMEOUT, TEXT_ONLY_PDF
+from utils import configure_pdfkit
+
+logger = logging.getLogger(__name__)
+
+# IndexII postbacks answer with a script that opens the document in a new window
+_WINDOW_OPEN_RE = re.compile(r"window\.open\(\s*['\"]([^'\"]+)['\"]")
+_HEAD_RE = re.compile(r"<head(?:\s[^>]*)?>", re.IGNORECASE)
+
+# wkhtmltopdf settings matching the browser's A4 printToPDF output
+_PDFKIT_OPTIONS = {
+    'page-size': 'A4',
+    'margin-top': '0.4in',
+    'margin-bottom': '0.4in',
+    'encoding': 'UTF-8',
+    'quiet': '',
+}
+if TEXT_ONLY_PDF:
+    _PDFKIT_OPTIONS['no-images'] = ''
+
+# Serialize the search form exactly as the browser would submit it
+_CAPTURE_FORM_JS = """
+var form = document.forms[0];
+var fields = [];
+if (form) {
+    new FormData(form).forEach(function(value, name) {
+        if (typeof value === 'string') { fields.push([name, value]); }
+    });
+}
+return {
+    url: form && form.action ? form.action : window.location.href,
+    fields: fields,
+    userAgent: navigator.userAgent
+};
+"""
+
+
+def capture_form_state(driver):
+    """Return the browser's form action URL, form fields and user agent."""
+    return driver.execute_script(_CAPTURE_FORM_JS)
+
+
+class ResultsPageParser(HTMLParser):
+    """Extract the ASP.NET form state, IndexII buttons and pager links from a results page."""
+
+    def __init__(self):
+        super().__init__()
+        self.hidden_fields = {}
+        self.index_buttons = []
+        self.page_links = set()
+        self.current_page = None
+        self._pager_depth = 0
+        self._in_span = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "input":
+            if (attrs.get("type") or "").lower() == "hidden" and attrs.get("name"):
+                self.hidden_fields[attrs["name"]] = attrs.get("value") or ""
+            elif attrs.get("value") == "IndexII":
+                self.index_buttons.append(attrs.get("onclick") or "")
+        elif tag == "tr" and (self._pager_depth or "GridPager" in (attrs.get("class") or "")):
+            # The pager row wraps its own nested table, so track row depth
+            self._pager_depth += 1
+        elif tag == "a" and "RegistrationGrid','Page$" in (attrs.get("href") or ""):
+            argument = attrs["href"].split("'Page$", 1)[1].split("'", 1)[0]
+            if argument.isdigit():
+                self.page_links.add(int(argument))
+        elif tag == "span" and self._pager_depth:
+            self._in_span = True
+
+    def handle_endtag(self, tag):
+        if tag == "span":
+            self._in_span = False
+        elif tag == "tr" and self._pager_depth:
+            self._pager_depth -= 1
+
+    def handle_data(self, data):
+        if self._in_span and data.strip().isdigit():
+            self.current_page = int(data.strip())
+
+
+def parse_results_page(html):
+    """Parse a results page HTML string into a ResultsPageParser."""
+    parser = ResultsPageParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+class PostbackClient:
+    """Replay ASP.NET postbacks of the results page over plain HTTP.
+
+    The browser is only needed to render JS-gated content; grid paging is a
+    standard form POST of the current __VIEWSTATE/__EVENTVALIDATION.
+    """
+
+    def __init__(self, url, cookies, form_fields, user_agent=None, timeout=TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.form_fields = dict(form_fields)
+        self.session = requests.Session()
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        for cookie in cookies:
+            self.session.cookies.set(cookie["name"], cookie["value"],
+                                     domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    @classmethod
+    def from_driver(cls, driver):
+        """Build a client sharing the browser's cookies and current form state."""
+        state = capture_form_state(driver)
+        return cls(state["url"], driver.get_cookies(), state["fields"], state.get("userAgent"))
+
+    def _post(self, target, argument):
+        data = dict(self.form_fields, __EVENTTARGET=target, __EVENTARGUMENT=argument)
+        response = self.session.post(self.url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def postback(self, target, argument):
+        """POST a __doPostBack(target, argument) and return the parsed response page."""
+        page = parse_results_page(self._post(target, argument).text)
+        # Carry the new ViewState forward so the next postback is accepted
+        self.form_fields.update(page.hidden_fields)
+        return page
+
+    def fetch_document(self, target, argument):
+        """
+        POST an IndexII postback and return the response holding the document it leads to.
+
+        Returns:
+            requests.Response: The document, HTML or PDF, or None if the postback
+            only re-rendered the results page
+        """
+        response = self._post(target, argument)
+        if is_pdf_response(response):
+            return response
+        match = _WINDOW_OPEN_RE.search(response.text)
+        if match is None:
+            if parse_results_page(response.text).index_buttons:
+                return None
+            # The document replaced the results page
+            return response
+
+        # Still on the results page: keep its new ViewState and follow the popup URL
+        self.form_fields.update(parse_results_page(response.text).hidden_fields)
+        document = self.session.get(urljoin(response.url, match.group(1)), timeout=self.timeout)
+        document.raise_for_status()
+        return document
+
+
+def is_pdf_response(response):
+    """Return True if an HTTP response body is already a PDF."""
+    return ("pdf" in response.headers.get("Content-Type", "").lower()
+            or response.content[:5] == b"%PDF-")
+
+
+def download_document(client, target, argument, pdf_path):
+    """
+    Fetch an IndexII document over HTTP and save it as a PDF.
+
+    PDFs served by the site are written as-is; HTML documents are rendered with wkhtmltopdf.
+
+    Args:
+        client: PostbackClient sharing the browser's session
+        target: __doPostBack event target
+        argument: __doPostBack event argument
+        pdf_path: Destination file path for the PDF
+
+    Returns:
+        bool: True if the PDF was written, False if the browser should fetch it instead
+    """
+    try:
+        document = client.fetch_document(target, argument)
+        if document is None:
+            return False
+        if is_pdf_response(document):
+            # One write of the whole body; no need for a Python-side buffer
+            with open(pdf_path, "wb", buffering=0) as pdf_file:
+                pdf_file.write(document.content)
+            return True
+        # Resolve the document's stylesheets and images against where it was served from
+        html = _HEAD_RE.sub(lambda m: f'{m.group(0)}<base href="{document.url}">', document.text, count=1)
+        pdfkit.from_string(html, pdf_path, configuration=configure_pdfkit(), options=_PDFKIT_OPTIONS)
+        return True
+    except Exception as e:
+        logger.warning(f"HTTP download of {pdf_path} failed, falling back to the browser: {str(e)}")
+        return False
+
+
+def scan_result_pages(driver, current_page, max_pages=100):
+    """
+    Walk the remaining result pages over HTTP to count documents per page.
+
+    This costs one extra POST per result page on top of the browser's own paging,
+    so the counts are only a progress hint for callers, never a reason to stop.
+
+    Args:
+        driver: WebDriver instance on the first results page
+        current_page: Page number the browser is currently showing
+        max_pages: Safety limit on the number of pages to walk
+
+    Returns:
+        dict: Mapping of page number to IndexII button count, or None if any
+        page did not come back as a results page (error page, expired session,
+        search form) or the walk did not reach the last page
+    """
+    try:
+        client = PostbackClient.from_driver(driver)
+        counts = {current_page: driver.execute_script(
+            "return document.querySelectorAll(\"input[value='IndexII']\").length;")}
+        page = current_page
+        links = parse_results_page(driver.page_source).page_links
+
+        while True:
+            # The pager only lists a window of pages; '...' links point past it
+            next_pages = [p for p in links if p > page]
+            if not next_pages:
+                break
+            if len(counts) >= max_pages:
+                logger.warning(f"HTTP pagination scan stopped after {max_pages} pages, counts are incomplete")
+                return None
+
+            result = client.postback("RegistrationGrid", f"Page${min(next_pages)}")
+            page = result.current_page or min(next_pages)
+            if not result.index_buttons or page in counts:
+                # A 200 that is not the next results page means the walk went wrong, not that it ended
+                logger.warning(f"HTTP pagination scan got no results page for page {min(next_pages)}")
+                return None
+
+            counts[page] = len(result.index_buttons)
+            links = result.page_links
+
+        logger.info(f"Scanned {len(counts)} result pages over HTTP: {sum(counts.values())} documents")
+        return counts
+    except Exception as e:
+        logger.warning(f"HTTP pagination scan failed, falling back to browser pagination: {str(e)}")
+        return None
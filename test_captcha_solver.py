@@ -0,0 +1,85 @@
+import pytest
+
+# The fixtures are PIL images, and captcha_solver imports Tesseract and selenium at import time
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("pytesseract")
+pytest.importorskip("selenium")
+
+from captcha_solver import otsu_threshold, otsu_binarize, segment_characters
+
+# Test Otsu threshold selection
+def test_otsu_threshold_bimodal():
+    """Test that the cutoff falls between the two gray levels of a two-tone image"""
+    gray = Image.new('L', (40, 20), color=200)
+    gray.paste(50, (10, 5, 30, 15))
+
+    cutoff = otsu_threshold(gray)
+
+    assert 50 <= cutoff < 200
+
+def test_otsu_threshold_tracks_background():
+    """Test that the cutoff moves with the image instead of staying at a fixed value"""
+    dark = Image.new('L', (40, 20), color=90)
+    dark.paste(10, (10, 5, 30, 15))
+    light = Image.new('L', (40, 20), color=250)
+    light.paste(160, (10, 5, 30, 15))
+
+    assert 10 <= otsu_threshold(dark) < 90
+    assert 160 <= otsu_threshold(light) < 250
+
+def test_otsu_threshold_uniform_image():
+    """Test that a single-tone image does not break the histogram walk"""
+    assert otsu_threshold(Image.new('L', (10, 10), color=128)) == 0
+
+def test_otsu_binarize():
+    """Test that binarizing maps text to black and background to white"""
+    gray = Image.new('L', (40, 20), color=180)
+    gray.paste(70, (10, 5, 30, 15))
+
+    binary = otsu_binarize(gray)
+
+    assert binary.getpixel((0, 0)) == 255
+    assert binary.getpixel((20, 10)) == 0
+    assert {value for _, value in binary.getcolors()} == {0, 255}
+
+# Test character segmentation
+def glyph_strip(*columns, size=(40, 12)):
+    """Draw black bars over (left, top, right, bottom) boxes on a white binary image."""
+    binary = Image.new('L', size, color=255)
+    for box in columns:
+        binary.paste(0, box)
+    return binary
+
+def test_segment_characters_left_to_right():
+    """Test that separated glyphs come back in order, cropped and padded"""
+    binary = glyph_strip((2, 2, 6, 8), (12, 1, 19, 11), (25, 4, 28, 6))
+
+    glyphs = segment_characters(binary)
+
+    # Each glyph is cropped to its ink and given a 4px white margin
+    assert [glyph.size for glyph in glyphs] == [(12, 14), (15, 18), (11, 10)]
+    assert all(glyph.getpixel((0, 0)) == 255 for glyph in glyphs)
+    assert glyphs[0].getpixel((4, 4)) == 0
+
+def test_segment_characters_drops_specks():
+    """Test that ink narrower than min_width is treated as noise"""
+    binary = glyph_strip((2, 2, 6, 8), (10, 5, 11, 6), (15, 2, 19, 8))
+
+    assert len(segment_characters(binary)) == 2
+    assert len(segment_characters(binary, min_width=1)) == 3
+
+def test_segment_characters_touching_glyphs():
+    """Test that glyphs without a blank column between them stay one segment"""
+    binary = glyph_strip((2, 2, 6, 8), (6, 2, 10, 8))
+
+    assert len(segment_characters(binary)) == 1
+
+def test_segment_characters_blank_image():
+    """Test that an image without ink yields no glyphs"""
+    assert segment_characters(glyph_strip()) == []
+
+def test_segment_characters_glyph_at_right_edge():
+    """Test that a glyph touching the right border is still closed off"""
+    binary = glyph_strip((35, 2, 40, 8))
+
+    assert [glyph.size for glyph in segment_characters(binary)] == [(13, 14)]
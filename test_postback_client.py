@@ -0,0 +1,143 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+# postback_client pulls in the HTTP, PDF and browser stack at import time; skip cleanly without it
+pytest.importorskip("requests")
+pytest.importorskip("pdfkit")
+pytest.importorskip("selenium")
+
+from postback_client import parse_results_page, scan_result_pages
+
+# A trimmed results page as rendered by the IGR search, with the pager on page 2
+RESULTS_PAGE = """
+<html><body>
+<form method="post" action="./eSearch.aspx" id="form1">
+<input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="dDwtMTIzNDU2Nzg5Ow==" />
+<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="/wEWAgLr" />
+<input type="text" name="txtSearch" value="not hidden" />
+<table id="RegistrationGrid">
+  <tr><th>Doc No</th><th>Index</th></tr>
+  <tr><td>101</td><td><input type="button" value="IndexII" onclick="javascript:__doPostBack('RegistrationGrid','indexII$0')" /></td></tr>
+  <tr><td>102</td><td><input type="button" value="IndexII" onclick="javascript:__doPostBack('RegistrationGrid','indexII$1')" /></td></tr>
+  <tr class="GridPager">
+    <td colspan="2">
+      <table><tr>
+        <td><a href="javascript:__doPostBack('RegistrationGrid','Page$1')">1</a></td>
+        <td><span>2</span></td>
+        <td><a href="javascript:__doPostBack('RegistrationGrid','Page$3')">3</a></td>
+        <td><a href="javascript:__doPostBack('RegistrationGrid','Page$11')">...</a></td>
+      </tr></table>
+    </td>
+  </tr>
+</table>
+<span>99</span>
+</form>
+</body></html>
+"""
+
+# What the site serves once the session has expired: the search form again
+SEARCH_FORM_PAGE = """
+<html><body>
+<form method="post" action="./eSearch.aspx">
+<input type="hidden" name="__VIEWSTATE" value="bmV3" />
+<select name="ddlDistrict"><option>Pune</option></select>
+</form>
+</body></html>
+"""
+
+
+def results_page(page, last_page, buttons=2):
+    """Build a minimal results page for page number `page` of `last_page`."""
+    rows = "".join(
+        f"<tr><td><input type=\"button\" value=\"IndexII\" "
+        f"onclick=\"javascript:__doPostBack('RegistrationGrid','indexII${i}')\" /></td></tr>"
+        for i in range(buttons)
+    )
+    pager = "".join(
+        f"<td><span>{p}</span></td>" if p == page
+        else f"<td><a href=\"javascript:__doPostBack('RegistrationGrid','Page${p}')\">{p}</a></td>"
+        for p in range(1, last_page + 1)
+    )
+    return (f"<input type=\"hidden\" name=\"__VIEWSTATE\" value=\"vs{page}\" />"
+            f"<table>{rows}<tr class=\"GridPager\"><td><table><tr>{pager}</tr></table></td></tr></table>")
+
+
+# Test hidden form state extraction
+def test_parse_hidden_fields():
+    """Test that hidden ASP.NET fields are captured and visible inputs are not"""
+    page = parse_results_page(RESULTS_PAGE)
+
+    assert page.hidden_fields["__VIEWSTATE"] == "dDwtMTIzNDU2Nzg5Ow=="
+    assert page.hidden_fields["__EVENTVALIDATION"] == "/wEWAgLr"
+    assert page.hidden_fields["__EVENTTARGET"] == ""
+    assert "txtSearch" not in page.hidden_fields
+
+# Test IndexII button extraction
+def test_parse_index_buttons():
+    """Test that IndexII buttons are listed in page order with their onclick handlers"""
+    page = parse_results_page(RESULTS_PAGE)
+
+    assert page.index_buttons == [
+        "javascript:__doPostBack('RegistrationGrid','indexII$0')",
+        "javascript:__doPostBack('RegistrationGrid','indexII$1')",
+    ]
+
+# Test pager parsing
+def test_parse_pager():
+    """Test that pager links and the current page come from the GridPager row only"""
+    page = parse_results_page(RESULTS_PAGE)
+
+    assert page.page_links == {1, 3, 11}
+    # The span after the grid is not part of the pager
+    assert page.current_page == 2
+
+def test_parse_non_results_page():
+    """Test that a page without a grid yields no buttons, links or current page"""
+    page = parse_results_page(SEARCH_FORM_PAGE)
+
+    assert page.index_buttons == []
+    assert page.page_links == set()
+    assert page.current_page is None
+    assert page.hidden_fields == {"__VIEWSTATE": "bmV3"}
+
+# Test the HTTP pagination scan
+@pytest.fixture
+def fake_client():
+    """Patch PostbackClient.from_driver with a client serving synthetic pages."""
+    client = MagicMock()
+    with patch('postback_client.PostbackClient.from_driver', return_value=client):
+        yield client
+
+@pytest.fixture
+def fake_driver():
+    driver = MagicMock()
+    driver.page_source = results_page(1, 3)
+    driver.execute_script.return_value = 2
+    return driver
+
+def test_scan_result_pages_counts_every_page(fake_driver, fake_client):
+    """Test that the scan follows the pager to the last page"""
+    fake_client.postback.side_effect = lambda target, argument: parse_results_page(
+        results_page(int(argument.split("$")[1]), 3, buttons=1))
+
+    assert scan_result_pages(fake_driver, 1) == {1: 2, 2: 1, 3: 1}
+
+def test_scan_result_pages_rejects_non_results_page(fake_driver, fake_client):
+    """Test that an expired-session page aborts the scan instead of ending it early"""
+    fake_client.postback.return_value = parse_results_page(SEARCH_FORM_PAGE)
+
+    assert scan_result_pages(fake_driver, 1) is None
+
+def test_scan_result_pages_rejects_repeated_page(fake_driver, fake_client):
+    """Test that a postback landing on an already counted page aborts the scan"""
+    fake_client.postback.return_value = parse_results_page(results_page(1, 3))
+
+    assert scan_result_pages(fake_driver, 1) is None
+
+def test_scan_result_pages_incomplete_at_max_pages(fake_driver, fake_client):
+    """Test that hitting max_pages with pages left reports no counts"""
+    fake_client.postback.side_effect = lambda target, argument: parse_results_page(
+        results_page(int(argument.split("$")[1]), 3))
+
+    assert scan_result_pages(fake_driver, 1, max_pages=2) is None
@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+# utils imports pdfkit and selenium's exception types at import time; skip cleanly without them
+pytest.importorskip("pdfkit")
+pytest.importorskip("selenium")
+
+from utils import retry, update_job, add_job, remove_job
+
+class FlakyError(Exception):
+    pass
+
+class FastRetryError(Exception):
+    pass
+
+@pytest.fixture
+def sleeps():
+    """Record backoff sleeps, taking the top of each jitter range."""
+    with patch('utils.time.sleep') as sleep, \
+            patch('utils.random.uniform', side_effect=lambda low, high: high):
+        yield sleep
+
+def failing(*errors, result="done"):
+    """Mock that raises each error in turn and then returns result."""
+    return MagicMock(side_effect=list(errors) + [result], __name__="failing")
+
+# Test the retry decorator
+def test_retry_returns_first_success(sleeps):
+    """Test that a call which succeeds is not retried"""
+    func = failing()
+
+    assert retry(FlakyError)(func)("arg", key=1) == "done"
+    func.assert_called_once_with("arg", key=1)
+    sleeps.assert_not_called()
+
+def test_retry_backs_off_exponentially(sleeps):
+    """Test that delays double from initial_delay and are capped at max_delay"""
+    func = failing(*[FlakyError("busy")] * 4)
+
+    assert retry(FlakyError, attempts=5, initial_delay=0.5, max_delay=1.5)(func)() == "done"
+    assert func.call_count == 5
+    assert [c.args[0] for c in sleeps.call_args_list] == [0.5, 1.0, 1.5, 1.5]
+
+def test_retry_jitters_within_half_delay():
+    """Test that each sleep is drawn from [delay / 2, delay]"""
+    func = failing(FlakyError("busy"))
+
+    with patch('utils.time.sleep'), patch('utils.random.uniform', return_value=0.3) as uniform:
+        retry(FlakyError, initial_delay=0.4)(func)()
+
+    uniform.assert_called_once_with(0.2, 0.4)
+
+def test_retry_reraises_after_last_attempt(sleeps):
+    """Test that the final failure propagates once attempts are used up"""
+    func = failing(*[FlakyError("busy")] * 3)
+
+    with pytest.raises(FlakyError):
+        retry(FlakyError, attempts=3)(func)()
+    assert func.call_count == 3
+    assert sleeps.call_count == 2
+
+def test_retry_ignores_unlisted_exceptions(sleeps):
+    """Test that exceptions outside the retried types propagate immediately"""
+    func = failing(ValueError("bad input"))
+
+    with pytest.raises(ValueError):
+        retry(FlakyError)(func)()
+    func.assert_called_once()
+    sleeps.assert_not_called()
+
+def test_retry_accepts_exception_tuple(sleeps):
+    """Test that every type in a tuple of exceptions is retried"""
+    func = failing(FlakyError("busy"), FastRetryError("stale"))
+
+    assert retry((FlakyError, FastRetryError), attempts=3)(func)() == "done"
+    assert func.call_count == 3
+
+def test_retry_no_wait_skips_backoff(sleeps):
+    """Test that no_wait exceptions are retried without sleeping"""
+    func = failing(FastRetryError("stale"), FlakyError("busy"), FastRetryError("stale"))
+
+    retry((FlakyError, FastRetryError), attempts=4, initial_delay=0.2,
+          no_wait=(FastRetryError,))(func)()
+
+    # Only the FlakyError on attempt 2 waits, at that attempt's delay
+    assert [c.args[0] for c in sleeps.call_args_list] == [0.4]
+
+def test_retry_preserves_function_name():
+    """Test that the wrapper keeps the wrapped function's metadata"""
+    @retry(FlakyError)
+    def click_index_button():
+        """Click the button."""
+
+    assert click_index_button.__name__ == "click_index_button"
+    assert click_index_button.__doc__ == "Click the button."
+
+# Test job status updates
+def test_update_job_replaces_entry_with_copy():
+    """Test that updates swap in a new dict and leave earlier snapshots untouched"""
+    jobs = {"job-1": {"status": "running", "progress": 10, "message": "Searching"}}
+    snapshot = jobs["job-1"]
+
+    update_job(jobs, "job-1", progress=50, message="Downloading")
+
+    assert jobs["job-1"] == {"status": "running", "progress": 50, "message": "Downloading"}
+    assert jobs["job-1"] is not snapshot
+    assert snapshot == {"status": "running", "progress": 10, "message": "Searching"}
+
+def test_update_job_adds_new_fields():
+    """Test that fields not yet on the job are added alongside the existing ones"""
+    jobs = {"job-1": {"status": "running"}}
+
+    update_job(jobs, "job-1", status="completed", zip_file="job-1.zip")
+
+    assert jobs["job-1"] == {"status": "completed", "zip_file": "job-1.zip"}
+
+def test_update_job_ignores_unknown_job():
+    """Test that updating a job that is no longer tracked does not recreate it"""
+    jobs = {"job-1": {"status": "running"}}
+
+    update_job(jobs, "job-2", status="failed")
+
+    assert jobs == {"job-1": {"status": "running"}}
+
+def test_remove_job_returns_entry_once():
+    """Test that a job is removed once and later updates do not bring it back"""
+    jobs = {}
+    add_job(jobs, "job-1", {"status": "starting"})
+
+    assert remove_job(jobs, "job-1") == {"status": "starting"}
+    assert remove_job(jobs, "job-1") is None
+
+    update_job(jobs, "job-1", status="running")
+    assert jobs == {}
@@ -1,13 +1,23 @@
 import time
 import os
+import base64
+import random
+import threading
 import pdfkit
 import logging
-from functools import lru_cache
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from config import get_wkhtmltopdf_path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
+from config import get_wkhtmltopdf_path, MAX_RETRIES
 
 logger = logging.getLogger(__name__)
 
+# Serializes writers of the shared jobs dictionary
+_jobs_lock = threading.Lock()
+
+# Writes debug screenshots in order, off the thread driving the browser
+_debug_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="debug-writer")
+
 @lru_cache(maxsize=1)
 def configure_pdfkit():
     """Return the proper configuration for pdfkit based on OS with caching."""
@@ -32,4 +42,105 @@ def wait_for_new_tab(driver, original_handles, timeout=10):
             time.sleep(0.5)
             continue
         time.sleep(0.5)
-    raise TimeoutException("New tab did not open within the timeout period")
\ No newline at end of file
+    raise TimeoutException("New tab did not open within the timeout period")
+
+def retry(exceptions, attempts=MAX_RETRIES, initial_delay=0.2, max_delay=2.0,
+          no_wait=(StaleElementReferenceException,)):
+    """Retry the decorated function on the given exception types with exponential backoff and jitter.
+
+    Exceptions listed in no_wait are retried immediately since a fresh element lookup is all they need.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except exceptions as e:
+                    if attempt == attempts:
+                        raise
+                    logger.warning(f"{func.__name__} failed (attempt {attempt}/{attempts}): {str(e)}")
+                    if not isinstance(e, no_wait):
+                        delay = min(max_delay, initial_delay * 2 ** (attempt - 1))
+                        time.sleep(random.uniform(delay / 2, delay))
+        return wrapper
+    return decorator
+
+def update_job(jobs, job_id, **fields):
+    """Apply several job status fields at once.
+
+    The job entry is replaced by an updated copy under a single lock, so readers
+    in other threads always see a consistent snapshot of a job.
+    """
+    with _jobs_lock:
+        job = jobs.get(job_id)
+        if job is None:
+            logger.warning(f"Job {job_id} no longer tracked, dropping status update")
+            return
+        jobs[job_id] = {**job, **fields}
+
+def add_job(jobs, job_id, job):
+    """Start tracking a job, under the same lock as update_job."""
+    with _jobs_lock:
+        jobs[job_id] = job
+
+def remove_job(jobs, job_id):
+    """Stop tracking a job; returns its last entry, or None if it was already removed.
+
+    Holding the lock keeps an in-flight update_job from bringing the job back.
+    """
+    with _jobs_lock:
+        return jobs.pop(job_id, None)
+
+def close_other_tabs(driver, keep_handle):
+    """Close every browser tab except keep_handle and switch to it.
+
+    Uses CDP target commands so tabs are closed without focusing each one first,
+    falling back to switching to and closing each tab when CDP is unavailable or
+    keep_handle is not one of the page target ids. Returns the number of tabs closed.
+    """
+    closed = 0
+    try:
+        targets = driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        page_ids = [target["targetId"] for target in targets if target["type"] == "page"]
+        # ChromeDriver window handles are normally the DevTools target ids; never close blind if they differ
+        if keep_handle in page_ids:
+            for target_id in page_ids:
+                if target_id != keep_handle:
+                    driver.execute_cdp_cmd("Target.closeTarget", {"targetId": target_id})
+                    closed += 1
+            driver.switch_to.window(keep_handle)
+            return closed
+        logger.debug("Window handle is not a DevTools target id, closing tabs one by one")
+    except WebDriverException as e:
+        logger.debug(f"CDP tab cleanup unavailable, closing tabs one by one: {str(e)}")
+    try:
+        for handle in driver.window_handles:
+            if handle != keep_handle:
+                driver.switch_to.window(handle)
+                driver.close()
+                closed += 1
+        driver.switch_to.window(keep_handle)
+    except WebDriverException as e:
+        logger.warning(f"Could not close extra tabs: {str(e)}")
+    return closed
+
+def save_error_screenshot(driver, path, quality=60):
+    """Save a JPEG screenshot for error forensics; much smaller and faster to encode than PNG."""
+    try:
+        data = driver.execute_cdp_cmd('Page.captureScreenshot', {'format': 'jpeg', 'quality': quality})
+        with open(path, 'wb') as f:
+            f.write(base64.b64decode(data['data']))
+    except Exception as e:
+        logger.warning(f"Could not save screenshot {path}: {str(e)}")
+
+def _write_debug_file(path, data):
+    try:
+        with open(path, 'wb') as f:
+            f.write(data)
+    except Exception as e:
+        logger.warning(f"Could not save screenshot {path}: {str(e)}")
+
+def save_debug_screenshot(driver, path):
+    """Capture a PNG screenshot and write it in the background; only the capture blocks the caller."""
+    _debug_writer.submit(_write_debug_file, path, driver.get_screenshot_as_png())
@@ -4,13 +4,36 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
+from utils import close_other_tabs
 
 logger = logging.getLogger(__name__)
 
+# Requests that add nothing to the saved documents: web fonts and analytics.
+# Images stay enabled because the search page's CAPTCHA is an image.
+BLOCKED_URL_PATTERNS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+
+# Once the CAPTCHA is solved, images can be skipped too when documents are saved text-only
+DOCUMENT_BLOCKED_URL_PATTERNS = BLOCKED_URL_PATTERNS + ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.svg"]
+
+def block_urls(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Make the driver's current tab skip requests matching patterns; returns False if CDP refused."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except Exception as e:
+        logger.warning(f"Could not block non-essential requests: {str(e)}")
+        return False
+
 class WebDriverPool:
-    def __init__(self, max_drivers=3):
+    def __init__(self, max_drivers=3, max_uses=50):
         self.max_drivers = max_drivers
+        self.max_uses = max_uses  # Checkouts before a driver is replaced, to bound Chrome's memory growth
         self.available_drivers = []
+        self.use_counts = {}
         self.lock = threading.Lock()
         
     def get_driver(self):
@@ -23,12 +46,7 @@ class WebDriverPool:
                 # Check for and close any extra tabs
                 try:
                     if len(driver.window_handles) > 1:
-                        current_handle = driver.current_window_handle
-                        for handle in driver.window_handles:
-                            if handle != current_handle:
-                                driver.switch_to.window(handle)
-                                driver.close()
-                        driver.switch_to.window(current_handle)
+                        close_other_tabs(driver, driver.current_window_handle)
                 except Exception as e:
                     logger.warning(f"Error cleaning up tabs on reused driver: {str(e)}")
                 
@@ -39,6 +57,7 @@ class WebDriverPool:
                 except Exception as e:
                     logger.warning(f"Error resetting driver state: {str(e)}")
                     # If we can't reset, create a new one
+                    self.use_counts.pop(driver, None)
                     try:
                         driver.quit()
                     except:
@@ -66,6 +85,7 @@ class WebDriverPool:
         options.add_argument("--disable-gpu")
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-popup-blocking")
+        options.add_argument("--run-all-compositor-stages-before-draw")  # Pages are fully painted when printed to PDF
         options.page_load_strategy = 'eager'  # Load page faster by not waiting for all resources
         
         # Uncomment for headless mode in production
@@ -100,13 +120,29 @@ class WebDriverPool:
         # Configure timeouts
         driver.set_page_load_timeout(60)  # Increase timeout for slow pages
         driver.set_script_timeout(30)
-        driver.implicitly_wait(10)  # Wait for elements to be available
+        # No implicit wait: every lookup that may race the page goes through an explicit
+        # WebDriverWait, and an implicit wait would stall each find_elements probe inside
+        # those polls (and every "is it there?" check) for the full implicit timeout
+        driver.implicitly_wait(0)
+        
+        # Skip fonts and trackers so pages load and print with fewer bytes
+        block_urls(driver)
         
         return driver
     
     def return_driver(self, driver):
-        """Return a WebDriver to the pool or quit it if pool is full"""
+        """Return a WebDriver to the pool or quit it if pool is full or the driver is worn out"""
         if driver:
+            with self.lock:
+                uses = self.use_counts.pop(driver, 0) + 1
+            if uses >= self.max_uses:
+                logger.debug(f"Recycling WebDriver after {uses} uses")
+                try:
+                    driver.quit()
+                except:
+                    pass
+                return
+            
             try:
                 # Clear cookies and reset state
                 driver.delete_all_cookies()
@@ -114,12 +150,7 @@ class WebDriverPool:
                 # Close any extra tabs
                 try:
                     if len(driver.window_handles) > 1:
-                        current_handle = driver.current_window_handle
-                        for handle in driver.window_handles:
-                            if handle != current_handle:
-                                driver.switch_to.window(handle)
-                                driver.close()
-                        driver.switch_to.window(current_handle)
+                        close_other_tabs(driver, driver.current_window_handle)
                 except Exception as e:
                     logger.warning(f"Error closing extra tabs: {str(e)}")
                 
@@ -132,6 +163,7 @@ class WebDriverPool:
                 with self.lock:
                     if len(self.available_drivers) < self.max_drivers:
                         self.available_drivers.append(driver)
+                        self.use_counts[driver] = uses
                         logger.debug("Returned WebDriver to pool")
                         return
                     
@@ -154,6 +186,7 @@ class WebDriverPool:
                 except:
                     pass
             self.available_drivers.clear()
+            self.use_counts.clear()
             
     def __del__(self):
         """Ensure we clean up resources when object is destroyed"""